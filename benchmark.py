@@ -0,0 +1,302 @@
+"""
+Benchmark reprodutível dos algoritmos de eight_puzzle.solucao.
+Gera um corpus de estados solúveis (a partir de uma semente) agrupados por faixa de custo ótimo,
+executa cada algoritmo sobre o corpus e micro-benchmarks das funções básicas, e grava os
+resultados em JSON, que podem ser comparados com uma base salva para apontar regressões.
+
+    python benchmark.py [--semente S] [--por-faixa N] [--faixas 0-9,10-19,...] [--algoritmos a,b]
+                        [--repeticoes R] [--memoria] [--saida resultados.json]
+                        [--base base.json] [--tolerancia 0.1]
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+import numpy as np
+import eight_puzzle.paralelo as paralelo
+import eight_puzzle.solucao as solucao
+
+FAIXAS = ((0, 9), (10, 19), (20, 24), (25, 31))
+
+# Algoritmos medidos, todos funções estado(str) -> ResultadoBusca (ou list[str], sem estatísticas)
+ALGORITMOS = {
+    'astar_hamming': lambda estado: solucao.astar(estado, 'hamming'),
+    'astar_manhattan': lambda estado: solucao.astar(estado, 'manhattan'),
+    'astar_manhattan_baldes': lambda estado: solucao.astar(estado, 'manhattan', fronteira='baldes'),
+    'astar_new_heuristic': lambda estado: solucao.astar(estado, 'padroes'),
+    'astar_new_heuristic_baldes': lambda estado: solucao.astar(estado, 'padroes', fronteira='baldes'),
+    'idastar_manhattan': lambda estado: solucao.idastar(estado, 'manhattan'),
+    'bfs': lambda estado: solucao.busca_bidirecional(estado),
+    'bfs_lote': lambda estado: solucao.busca_em_camadas_lote(estado),
+    'astar_bidirecional_manhattan': lambda estado: solucao.astar_bidirecional(estado, 'manhattan'),
+    'astar_ponderado_manhattan': lambda estado: solucao.astar(estado, 'manhattan', peso=2),
+    'gulosa_manhattan': lambda estado: solucao.astar(estado, 'manhattan', peso=float('inf')),
+    'ara_manhattan': lambda estado: solucao.ara_estrela(estado, 'manhattan'),
+    'astar_paralelo_manhattan': lambda estado: paralelo.astar_paralelo(estado, 'manhattan'),
+    'oraculo': solucao.oraculo,
+}
+
+# Algoritmos cuja quantidade de nodos expandidos depende da ordem de execução dos processos,
+# não comparada com a base
+NAO_DETERMINISTICOS = {'astar_paralelo_manhattan'}
+
+# Funções medidas isoladamente, todas chamadas com um estado do corpus
+MICRO_BENCHMARKS = {
+    'sucessor': solucao.sucessor,
+    'expande': lambda estado: solucao.expande(solucao.Nodo(estado, None, None, 0)),
+    'distancia_manhattan': solucao.distancia_manhattan,
+}
+
+
+def nome_faixa(faixa)->str:
+    return f"{faixa[0]}-{faixa[1]}"
+
+
+def estado_do_rank(rank:int)->str:
+    """
+    Recebe o rank de uma permutação das peças (o índice usado em solucao.rank_estado) e retorna o estado
+    :param rank: int
+    :return: str
+    """
+    n = solucao.NUMERO_POSICOES
+    digitos = []
+    for i in range(n - 1, -1, -1):                   # desfaz rank = rank * (n - i) + digito
+        rank, digito = divmod(rank, n - i)
+        digitos.append(digito)
+    digitos.reverse()
+
+    livres = list(range(n))
+    return "".join(solucao.SIMBOLOS[livres.pop(digito)] for digito in digitos)
+
+
+def gera_corpus(por_faixa:int=5, faixas=FAIXAS, semente:int=0)->dict:
+    """
+    Sorteia, para cada faixa de custo ótimo, até `por_faixa` estados solúveis com custo na faixa.
+    O custo de cada estado vem da tabela de distâncias exatas do oráculo, e o sorteio depende apenas
+    da semente, então o mesmo corpus é gerado em qualquer máquina
+    :param por_faixa: int, estados por faixa
+    :param faixas: Iterable[Tuple[int,int]], faixas de custo ótimo (inclusivas)
+    :param semente: int
+    :return: dict, nome da faixa -> lista de [estado, custo ótimo]
+    """
+    distancias = np.frombuffer(solucao.pega_oraculo().tabela, dtype=np.uint8)
+    sorteio = random.Random(semente)
+    corpus = {}
+    for faixa in faixas:
+        ranks = np.flatnonzero((distancias >= faixa[0]) & (distancias <= faixa[1]))
+        escolhidos = sorteio.sample(range(len(ranks)), min(por_faixa, len(ranks)))
+        corpus[nome_faixa(faixa)] = [[estado_do_rank(int(ranks[i])), int(distancias[ranks[i]])] for i in escolhidos]
+    return corpus
+
+
+def percentil(valores:list, p:float)->float:
+    """
+    Retorna o percentil p (0 a 100) dos valores, pelo método do posto mais próximo
+    :param valores: list[float]
+    :param p: float
+    :return: float
+    """
+    ordenados = sorted(valores)
+    posto = max(1, -(-len(ordenados) * p // 100))
+    return ordenados[int(posto) - 1]
+
+
+def mede_algoritmo(algoritmo, instancias:list, repeticoes:int=1, memoria:bool=False)->dict:
+    """
+    Executa o algoritmo sobre as instâncias e retorna latências, nodos por segundo, memória, a razão
+    média entre o custo encontrado e o ótimo e a quantidade de respostas incorretas: sem caminho, ou
+    com custo abaixo do ótimo ou acima do fator_subotimo informado pela busca (1 nas buscas ótimas)
+    :param algoritmo: callable, estado(str) -> ResultadoBusca ou list[str]
+    :param instancias: list, pares [estado, custo ótimo]
+    :param repeticoes: int, execuções por instância (a latência da instância é a menor delas)
+    :param memoria: bool, mede o pico de memória em uma execução extra sob tracemalloc
+    :return: dict
+    """
+    latencias = []
+    expandidos = []
+    picos = []
+    custos_relativos = []
+    incorretos = 0
+
+    for estado, custo_otimo in instancias:
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            resposta = algoritmo(estado)
+            tempos.append(time.perf_counter() - inicio)
+        latencias.append(min(tempos))
+
+        caminho = resposta.caminho if isinstance(resposta, solucao.ResultadoBusca) else resposta
+        fator_subotimo = resposta.fator_subotimo if isinstance(resposta, solucao.ResultadoBusca) else 1
+        if caminho is None or not custo_otimo <= len(caminho) <= fator_subotimo * custo_otimo:
+            incorretos += 1
+        if caminho is not None:
+            custos_relativos.append(len(caminho) / custo_otimo if custo_otimo else 1.0)
+        if isinstance(resposta, solucao.ResultadoBusca):
+            expandidos.append(resposta.nodos_expandidos)
+
+        if memoria:
+            with solucao.MonitorDeBusca(tempos=False, memoria=True) as monitor:
+                algoritmo(estado)
+            picos.append(monitor.pico_memoria)
+
+    return {
+        'instancias': len(instancias),
+        'incorretos': incorretos,
+        'custo_relativo': sum(custos_relativos) / len(custos_relativos) if custos_relativos else None,
+        'nodos_expandidos': sum(expandidos) / len(expandidos) if expandidos else None,
+        'nodos_por_segundo': sum(expandidos) / sum(latencias) if expandidos and sum(latencias) else None,
+        'latencia': {
+            'media': sum(latencias) / len(latencias),
+            'p50': percentil(latencias, 50),
+            'p90': percentil(latencias, 90),
+            'p99': percentil(latencias, 99),
+            'max': max(latencias),
+        },
+        'pico_memoria': max(picos) if picos else None,
+    }
+
+
+def mede_micro(funcao, estados:list, repeticoes:int=5)->float:
+    """
+    Retorna o menor tempo médio, em nanossegundos, de uma chamada da função sobre os estados
+    :param funcao: callable, estado(str) -> qualquer
+    :param estados: list[str]
+    :param repeticoes: int
+    :return: float
+    """
+    vezes = max(1, 2000 // len(estados))
+    tempos = timeit.repeat(lambda: [funcao(estado) for estado in estados], number=vezes, repeat=repeticoes)
+    return min(tempos) / (vezes * len(estados)) * 1e9
+
+
+def executa(por_faixa:int=5, faixas=FAIXAS, semente:int=0, algoritmos=None,
+            repeticoes:int=3, memoria:bool=False, saida=sys.stdout)->dict:
+    """
+    Gera o corpus, mede os algoritmos e as funções básicas e retorna os resultados
+    :param por_faixa: int, estados por faixa de custo ótimo
+    :param faixas: Iterable[Tuple[int,int]]
+    :param semente: int
+    :param algoritmos: Iterable[str], nomes em ALGORITMOS (todos por padrão)
+    :param repeticoes: int, execuções por instância
+    :param memoria: bool, mede o pico de memória
+    :param saida: arquivo onde o progresso é escrito (None para silêncio)
+    :return: dict, serializável em JSON
+    """
+    corpus = gera_corpus(por_faixa, faixas, semente)
+    solucao.pega_banco_de_padroes()                             # carrega as tabelas fora das medições
+    resultados = {
+        'meta': {
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'semente': semente,
+            'repeticoes': repeticoes,
+        },
+        'corpus': corpus,
+        'algoritmos': {},
+        'micro': {},
+    }
+
+    for nome in algoritmos or ALGORITMOS:
+        if nome not in ALGORITMOS:
+            raise ValueError(f"algoritmo desconhecido: {nome}")
+        resultados['algoritmos'][nome] = {}
+        for faixa, instancias in corpus.items():
+            medida = mede_algoritmo(ALGORITMOS[nome], instancias, repeticoes, memoria)
+            resultados['algoritmos'][nome][faixa] = medida
+            if saida is not None:
+                nodos_por_segundo = f"  nodos/s {medida['nodos_por_segundo']:12.0f}" if medida['nodos_por_segundo'] else ""
+                print(f"{nome:30} {faixa:>6}  p50 {medida['latencia']['p50'] * 1000:9.2f} ms  "
+                      f"p99 {medida['latencia']['p99'] * 1000:9.2f} ms{nodos_por_segundo}", file=saida)
+
+    estados = [estado for instancias in corpus.values() for estado, _ in instancias]
+    for nome, funcao in MICRO_BENCHMARKS.items():
+        resultados['micro'][nome] = {'ns_por_chamada': mede_micro(funcao, estados)}
+        if saida is not None:
+            print(f"{nome:30} {resultados['micro'][nome]['ns_por_chamada']:9.0f} ns/chamada", file=saida)
+
+    return resultados
+
+
+def compara(atual:dict, base:dict, tolerancia:float=0.1)->list[str]:
+    """
+    Compara resultados com uma base gerada com o mesmo corpus e retorna a lista de regressões:
+    respostas fora do custo garantido, mais nodos expandidos, custo relativo maior, ou latência (p50),
+    memória ou micro-benchmark mais de `tolerancia` acima da base
+    :param atual: dict, retornado por executa
+    :param base: dict, retornado por executa
+    :param tolerancia: float, aumento relativo tolerado
+    :return: list[str]
+    """
+    if atual['corpus'] != base['corpus']:
+        raise ValueError("o corpus dos resultados é diferente do corpus da base")
+
+    regressoes = []
+    def verifica(descricao, valor, valor_base, limite):
+        if valor is not None and valor_base is not None and valor > valor_base * limite:
+            regressoes.append(f"{descricao}: {valor_base:.6g} -> {valor:.6g}")
+
+    for nome, faixas in atual['algoritmos'].items():
+        for faixa, medida in faixas.items():
+            if medida['incorretos']:
+                regressoes.append(f"{nome} {faixa}: {medida['incorretos']} respostas fora do custo garantido")
+            medida_base = base['algoritmos'].get(nome, {}).get(faixa)
+            if medida_base is None:
+                continue
+            if nome not in NAO_DETERMINISTICOS:
+                verifica(f"{nome} {faixa} nodos expandidos", medida['nodos_expandidos'], medida_base['nodos_expandidos'], 1)
+            verifica(f"{nome} {faixa} custo relativo", medida.get('custo_relativo'), medida_base.get('custo_relativo'), 1)
+            verifica(f"{nome} {faixa} latência p50", medida['latencia']['p50'], medida_base['latencia']['p50'], 1 + tolerancia)
+            verifica(f"{nome} {faixa} pico de memória", medida['pico_memoria'], medida_base['pico_memoria'], 1 + tolerancia)
+
+    for nome, medida in atual['micro'].items():
+        if nome in base['micro']:
+            verifica(f"{nome} ns/chamada", medida['ns_por_chamada'], base['micro'][nome]['ns_por_chamada'], 1 + tolerancia)
+
+    return regressoes
+
+
+def le_faixas(texto:str)->tuple:
+    """
+    Converte "0-9,10-19" em ((0, 9), (10, 19))
+    """
+    return tuple(tuple(int(limite) for limite in faixa.split('-')) for faixa in texto.split(','))
+
+
+def main(argumentos=None)->int:
+    parser = argparse.ArgumentParser(description="Benchmark dos algoritmos de eight_puzzle.solucao")
+    parser.add_argument('--semente', type=int, default=0, help="semente do sorteio do corpus")
+    parser.add_argument('--por-faixa', type=int, default=5, help="estados por faixa de custo ótimo")
+    parser.add_argument('--faixas', type=le_faixas, default=FAIXAS, help="faixas de custo, ex.: 0-9,10-19,20-31")
+    parser.add_argument('--algoritmos', type=lambda texto: texto.split(','), default=None,
+                        help=f"algoritmos separados por vírgula (padrão: todos de {', '.join(ALGORITMOS)})")
+    parser.add_argument('--repeticoes', type=int, default=3, help="execuções por instância")
+    parser.add_argument('--memoria', action='store_true', help="mede o pico de memória (execução extra sob tracemalloc)")
+    parser.add_argument('--saida', help="arquivo JSON onde os resultados são gravados")
+    parser.add_argument('--base', help="arquivo JSON de resultados anteriores para comparação")
+    parser.add_argument('--tolerancia', type=float, default=0.1, help="aumento relativo tolerado na comparação")
+    argumentos = parser.parse_args(argumentos)
+
+    resultados = executa(argumentos.por_faixa, argumentos.faixas, argumentos.semente, argumentos.algoritmos,
+                         argumentos.repeticoes, argumentos.memoria)
+    if argumentos.saida:
+        with open(argumentos.saida, 'w') as arquivo:
+            json.dump(resultados, arquivo, indent=2)
+
+    if argumentos.base:
+        with open(argumentos.base) as arquivo:
+            regressoes = compara(resultados, json.load(arquivo), argumentos.tolerancia)
+        for regressao in regressoes:
+            print(f"REGRESSÃO {regressao}")
+        if regressoes:
+            return 1
+        print("sem regressões")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
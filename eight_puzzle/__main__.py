@@ -0,0 +1,7 @@
+"""
+Ponto de entrada de `python -m eight_puzzle`. Veja eight_puzzle.servico.
+"""
+import sys
+from eight_puzzle.servico import main
+
+sys.exit(main())
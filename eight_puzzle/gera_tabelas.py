@@ -0,0 +1,34 @@
+"""
+Gera (ou regera) as tabelas em disco usadas pelas heurísticas de eight_puzzle.solucao.
+Uso: python -m eight_puzzle.gera_tabelas [--diretorio DIRETORIO] [--forca] [--oraculo]
+"""
+import argparse
+import time
+import eight_puzzle.solucao as solucao
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Gera as tabelas de padrões disjuntos do 8-puzzle")
+    parser.add_argument('--diretorio', default=solucao.DIRETORIO_TABELAS,
+                        help=f"diretório de saída (padrão: {solucao.DIRETORIO_TABELAS})")
+    parser.add_argument('--forca', action='store_true',
+                        help="regera as tabelas mesmo que os arquivos já existam")
+    parser.add_argument('--oraculo', action='store_true',
+                        help="também gera a tabela de distâncias exatas de todos os estados")
+    argumentos = parser.parse_args(argumentos)
+
+    for padrao in solucao.PADROES_DISJUNTOS:
+        inicio = time.perf_counter()
+        solucao.carrega_tabela_padrao(padrao, argumentos.diretorio, regerar=argumentos.forca)
+        caminho = solucao.caminho_tabela_padrao(padrao, argumentos.diretorio)
+        print(f"{caminho}: {time.perf_counter() - inicio:.3f}s")
+
+    if argumentos.oraculo:
+        inicio = time.perf_counter()
+        solucao.carrega_tabela_distancias(argumentos.diretorio, regerar=argumentos.forca)
+        caminho = solucao.caminho_tabela_distancias(argumentos.diretorio)
+        print(f"{caminho}: {time.perf_counter() - inicio:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
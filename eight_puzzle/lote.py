@@ -0,0 +1,260 @@
+"""
+Resolução de lotes de estados em um conjunto persistente de processos.
+Cada processo trabalhador atende uma tarefa por vez através de um Pipe próprio, o que permite
+interromper apenas o trabalhador de uma tarefa que estourou o tempo, sem derrubar os demais.
+"""
+import atexit
+import multiprocessing as mp
+import os
+import time
+from multiprocessing.connection import wait
+import eight_puzzle.solucao as solucao
+
+TEMPO_ESGOTADO = 'timeout'
+TRABALHADOR_ENCERRADO = 'erro'                                  # resposta de quem morreu durante a tarefa
+_FIM = object()
+
+# Tabelas carregadas no processo principal antes de distribuir as tarefas de cada algoritmo.
+# Com o início por fork os trabalhadores herdam os mapeamentos; nos demais casos eles mapeiam
+# os mesmos arquivos, compartilhando as páginas pelo cache do sistema operacional.
+TABELAS_POR_ALGORITMO = {
+    'astar_new_heuristic': solucao.pega_banco_de_padroes,
+    'oraculo': solucao.pega_oraculo,
+}
+
+
+def pega_algoritmo(algoritmo)->callable:
+    """
+    Recebe o nome de uma função de busca de eight_puzzle.solucao (ou a própria função) e retorna a função
+    :param algoritmo: str ou callable
+    :return: callable
+    """
+    if callable(algoritmo):
+        return algoritmo
+    funcao = getattr(solucao, algoritmo, None)
+    if not callable(funcao):
+        raise ValueError(f"algoritmo desconhecido: {algoritmo}")
+    return funcao
+
+
+def _executa_tarefas(conexao):
+    """
+    Laço de um processo trabalhador: recebe (estado, algoritmo) pela conexão e devolve
+    (estado, resposta, erro) até receber None
+    :param conexao: multiprocessing.connection.Connection
+    """
+    while True:
+        tarefa = conexao.recv()
+        if tarefa is None:
+            break
+        estado, algoritmo = tarefa
+        try:
+            conexao.send((estado, pega_algoritmo(algoritmo)(estado), None))
+        except Exception as erro:
+            conexao.send((estado, None, erro))
+
+
+class PoolDeBusca:
+    """
+    Conjunto persistente de processos trabalhadores para resolver lotes de estados
+    """
+    def __init__(self, workers:int=None, algoritmos=()):
+        """
+        Carrega as tabelas dos algoritmos recebidos e inicia os processos trabalhadores
+        :param workers: int, quantidade de processos (os.cpu_count() por padrão)
+        :param algoritmos: Iterable[str], nomes em TABELAS_POR_ALGORITMO cujas tabelas são carregadas antes do fork
+        """
+        metodos = mp.get_all_start_methods()
+        self.contexto = mp.get_context('fork' if 'fork' in metodos else None)
+        self.tabelas_carregadas = set()
+        self._carrega_tabelas(algoritmos)
+        self.trabalhadores = [self._inicia_trabalhador() for _ in range(workers or os.cpu_count() or 1)]
+
+    def _carrega_tabelas(self, algoritmos)->bool:
+        """
+        Carrega no processo principal as tabelas dos algoritmos que ainda não foram carregadas
+        :param algoritmos: Iterable, nomes de algoritmos (os que não estão em TABELAS_POR_ALGORITMO são ignorados)
+        :return: bool, verdadeiro se alguma tabela foi carregada
+        """
+        novos = {algoritmo for algoritmo in algoritmos
+                 if isinstance(algoritmo, str) and algoritmo in TABELAS_POR_ALGORITMO} - self.tabelas_carregadas
+        for algoritmo in novos:
+            TABELAS_POR_ALGORITMO[algoritmo]()
+        self.tabelas_carregadas |= novos
+        return bool(novos)
+
+    def _inicia_trabalhador(self):
+        """
+        Inicia um processo trabalhador e retorna a tupla (processo, conexão)
+        :return: tuple
+        """
+        conexao_pai, conexao_filho = self.contexto.Pipe()
+        processo = self.contexto.Process(target=_executa_tarefas, args=(conexao_filho,), daemon=True)
+        processo.start()
+        conexao_filho.close()
+        return processo, conexao_pai
+
+    def _reinicia_trabalhador(self, indice:int):
+        """
+        Interrompe o trabalhador do índice recebido (cuja tarefa estourou o tempo) e o substitui
+        :param indice: int
+        """
+        processo, conexao = self.trabalhadores[indice]
+        processo.terminate()
+        processo.join()
+        conexao.close()
+        self.trabalhadores[indice] = self._inicia_trabalhador()
+
+    def resolve(self, estados, algoritmo='astar_manhattan', timeout:float=None, unicos:bool=True,
+                ordenado:bool=False, em_andamento:int=None):
+        """
+        Resolve os estados recebidos e gera tuplas (estado, resposta) à medida que cada um termina.
+        Estados repetidos são resolvidos (e gerados) uma única vez, a menos que unicos seja falso.
+        Quando uma tarefa passa de `timeout` segundos, seu trabalhador é substituído e a resposta é
+        TEMPO_ESGOTADO; quando o trabalhador morre durante a tarefa, ele é substituído e a resposta é
+        TRABALHADOR_ENCERRADO. Com ordenado, as respostas são geradas na ordem dos estados recebidos, e as que
+        terminam antes da vez ficam guardadas. Novos estados só são lidos enquanto houver trabalhador
+        livre e menos de `em_andamento` estados lidos e ainda não gerados.
+        :param estados: Iterable[str], consumido sob demanda
+        :param algoritmo: str (nome de função em eight_puzzle.solucao) ou callable de nível de módulo
+        :param timeout: float, limite de tempo por estado em segundos (None para sem limite)
+        :param unicos: bool, resolve cada estado repetido uma única vez
+        :param ordenado: bool, gera as respostas na ordem dos estados recebidos
+        :param em_andamento: int, máximo de estados lidos e ainda não gerados (o dobro da quantidade de trabalhadores por padrão)
+        :return: Iterator[Tuple[str, list[str]]]
+        """
+        pega_algoritmo(algoritmo)                                   # valida antes de distribuir tarefas
+        if self._carrega_tabelas([algoritmo]):                      # trabalhadores recriados para herdar a tabela
+            for indice in range(len(self.trabalhadores)):
+                self._reinicia_trabalhador(indice)
+
+        pendentes = iter(estados)
+        vistos = set()
+        tarefas = {}                                                # índice do trabalhador -> (número, estado, prazo)
+        guardadas = {}                                              # número -> (estado, resposta), no modo ordenado
+        numero_lido = 0
+        numero_gerado = 0
+        limite = em_andamento or 2 * len(self.trabalhadores)
+        livres = list(range(len(self.trabalhadores)))
+        esgotado = False
+
+        try:
+            while not esgotado or tarefas:
+                # distribui um estado para cada trabalhador livre, sem passar do limite de estados em andamento
+                while livres and not esgotado and len(tarefas) + len(guardadas) < limite:
+                    estado = next(pendentes, _FIM)
+                    if estado is _FIM:
+                        esgotado = True
+                    elif not unicos or estado not in vistos:
+                        if unicos:
+                            vistos.add(estado)
+                        indice = livres.pop()
+                        self.trabalhadores[indice][1].send((estado, algoritmo))
+                        prazo = time.monotonic() + timeout if timeout is not None else None
+                        tarefas[indice] = (numero_lido, estado, prazo)
+                        numero_lido += 1
+
+                if not tarefas:
+                    continue
+
+                prazos = [prazo for _, _, prazo in tarefas.values() if prazo is not None]
+                espera = max(0.0, min(prazos) - time.monotonic()) if prazos else None
+                prontas = wait([self.trabalhadores[indice][1] for indice in tarefas], espera)
+
+                for indice in list(tarefas):
+                    numero, estado, prazo = tarefas[indice]
+                    conexao = self.trabalhadores[indice][1]
+                    if conexao in prontas:
+                        del tarefas[indice]
+                        livres.append(indice)
+                        try:
+                            estado, resposta, erro = conexao.recv()
+                        except (EOFError, OSError):                 # o trabalhador morreu durante a tarefa
+                            self._reinicia_trabalhador(indice)
+                            resposta, erro = TRABALHADOR_ENCERRADO, None
+                        if erro is not None:
+                            raise erro
+                    elif prazo is not None and time.monotonic() >= prazo:
+                        del tarefas[indice]
+                        self._reinicia_trabalhador(indice)
+                        livres.append(indice)
+                        resposta = TEMPO_ESGOTADO
+                    else:
+                        continue
+
+                    if not ordenado:
+                        yield estado, resposta
+                        continue
+                    guardadas[numero] = (estado, resposta)
+                    while numero_gerado in guardadas:                   # gera as respostas que já chegaram na vez
+                        yield guardadas.pop(numero_gerado)
+                        numero_gerado += 1
+        finally:
+            # se o consumidor parar antes do fim (ou um algoritmo falhar), os trabalhadores ainda
+            # ocupados são substituídos para que respostas antigas não apareçam no próximo lote
+            for indice in tarefas:
+                self._reinicia_trabalhador(indice)
+
+    def fecha(self):
+        """
+        Encerra os processos trabalhadores
+        """
+        for processo, conexao in self.trabalhadores:
+            try:
+                conexao.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            conexao.close()
+        for processo, _ in self.trabalhadores:
+            processo.join(timeout=1)
+            if processo.is_alive():
+                processo.terminate()
+        self.trabalhadores = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fecha()
+
+
+_pool = None
+
+
+def pega_pool(workers:int=None, algoritmo=None)->PoolDeBusca:
+    """
+    Retorna o pool persistente do módulo, recriando-o apenas se a quantidade de processos mudar
+    :param workers: int, quantidade de processos (os.cpu_count() por padrão)
+    :param algoritmo: str, carrega a tabela do algoritmo antes de iniciar um pool novo
+    :return: PoolDeBusca
+    """
+    global _pool
+    workers = workers or os.cpu_count() or 1
+    if _pool is None or len(_pool.trabalhadores) != workers:
+        if _pool is not None:
+            _pool.fecha()
+        _pool = PoolDeBusca(workers, [algoritmo])
+    return _pool
+
+
+@atexit.register
+def _fecha_pool():
+    if _pool is not None:
+        _pool.fecha()
+
+
+def resolve_lote(estados, algoritmo='astar_manhattan', workers:int=None, timeout:float=None,
+                 unicos:bool=True, ordenado:bool=False, em_andamento:int=None):
+    """
+    Resolve um lote de estados no pool persistente do módulo e gera tuplas (estado, resposta)
+    à medida que cada estado termina. Veja PoolDeBusca.resolve.
+    :param estados: Iterable[str]
+    :param algoritmo: str (nome de função em eight_puzzle.solucao) ou callable de nível de módulo
+    :param workers: int, quantidade de processos (os.cpu_count() por padrão)
+    :param timeout: float, limite de tempo por estado em segundos (None para sem limite)
+    :param unicos: bool, resolve cada estado repetido uma única vez
+    :param ordenado: bool, gera as respostas na ordem dos estados recebidos
+    :param em_andamento: int, máximo de estados lidos e ainda não gerados (o dobro da quantidade de trabalhadores por padrão)
+    :return: Iterator[Tuple[str, list[str]]]
+    """
+    return pega_pool(workers, algoritmo).resolve(estados, algoritmo, timeout, unicos, ordenado, em_andamento)
@@ -0,0 +1,278 @@
+"""
+Busca A* paralela com distribuição dos estados por hash (HDA*).
+Cada processo trabalhador é dono dos estados cujo hash cai no seu índice: só ele guarda o melhor custo
+conhecido e a fronteira desses estados. Os vizinhos de outros donos são acumulados em remessas e
+enviados pela fila do dono, então cada estado é expandido no processo que detecta seus duplicados.
+Os nodos carregam o caminho desde a raiz codificado em um inteiro (2 bits por ação), o que dispensa
+reconstruir o caminho entre processos. O primeiro objetivo encontrado dá um limite superior C (compartilhado);
+nodos com f >= C são descartados, e a busca termina quando todos os trabalhadores estão ociosos e
+não há remessas em trânsito, quando não resta nodo com f < C e C é ótimo.
+"""
+import heapq
+import math
+import multiprocessing as mp
+import os
+import queue
+import time
+import eight_puzzle.solucao as solucao
+
+# Multiplicador de Fibonacci (2^64 / razão áurea): espalha os códigos, cujos bits baixos são só a primeira peça
+MULTIPLICADOR_HASH = 0x9E3779B97F4A7C15
+MASCARA_HASH = (1 << 64) - 1
+QUANTUM = 256                                                   # expansões entre leituras das filas e do limite C
+ESPERA_OCIOSO = 0.001                                           # segundos de espera por remessas quando ocioso
+INTERVALO_COORDENADOR = 0.0005                                  # segundos entre verificações de término
+
+
+def dono_do_estado(codigo:int, workers:int)->int:
+    """
+    Retorna o índice do trabalhador dono do estado
+    :param codigo: int, representação inteira do estado
+    :param workers: int, quantidade de trabalhadores
+    :return: int
+    """
+    return (((codigo * MULTIPLICADOR_HASH) & MASCARA_HASH) >> 32) % workers
+
+
+def decodifica_caminho(caminho:int, custo:int)->list[str]:
+    """
+    Recebe um caminho codificado (2 bits por ação, a primeira nos bits mais altos) e seu custo
+    e retorna a lista de ações
+    :param caminho: int
+    :param custo: int, quantidade de ações
+    :return: list[str]
+    """
+    return [solucao.ACOES[(caminho >> (2 * (custo - 1 - passo))) & 3] for passo in range(custo)]
+
+
+class _EstadoCompartilhado:
+    """
+    Memória compartilhada entre o coordenador e os trabalhadores: filas de remessas, limite superior C,
+    contadores de remessas enviadas e recebidas, marcas de ociosidade e versões (incrementadas sempre
+    que um trabalhador ocioso volta a trabalhar), usados na detecção de término
+    """
+    def __init__(self, contexto, workers:int):
+        self.workers = workers
+        self.filas = [contexto.Queue() for _ in range(workers)]
+        self.solucoes = contexto.Queue()                        # (custo, caminho codificado) de cada melhoria de C
+        self.estatisticas = contexto.Queue()                    # contadores de cada trabalhador ao terminar
+        self.melhor_custo = contexto.RawValue('q', -1)          # C, -1 enquanto não há solução
+        self.trava_melhor = contexto.Lock()
+        self.parar = contexto.RawValue('b', 0)
+        self.enviadas = contexto.RawArray('q', workers)
+        self.recebidas = contexto.RawArray('q', workers)
+        self.ociosos = contexto.RawArray('b', workers)
+        self.versoes = contexto.RawArray('q', workers)
+        self.expandidos = contexto.RawArray('q', workers)
+
+    def foto(self)->tuple:
+        """
+        Retorna (ociosos, versões, total enviado, total recebido), lidos nessa ordem
+        :return: tuple
+        """
+        return tuple(self.ociosos), tuple(self.versoes), sum(self.enviadas), sum(self.recebidas)
+
+
+def _trabalhador(indice:int, estado:str, heuristica:str, tamanho_remessa:int, compartilhado:_EstadoCompartilhado):
+    """
+    Laço de um trabalhador: expande os nodos da própria fronteira em ordem de f, envia os vizinhos de
+    outros donos em remessas e insere as remessas recebidas, até o coordenador mandar parar
+    :param indice: int, índice do trabalhador
+    :param estado: str, estado inicial
+    :param heuristica: str, nome de uma heurística em DefinicaoPuzzle.tabelas
+    :param tamanho_remessa: int, vizinhos acumulados antes de enviar uma remessa
+    :param compartilhado: _EstadoCompartilhado
+    """
+    puzzle = solucao.puzzle_do_estado(estado)
+    tabela = puzzle.tabelas[heuristica]
+    codigo_final = puzzle.codigo_final
+    workers = compartilhado.workers
+    fila = compartilhado.filas[indice]
+    for outra in compartilhado.filas:                          # remessas não lidas não impedem o processo de sair
+        outra.cancel_join_thread()
+
+    abertos = []                                                # (f, -g, código, h, caminho codificado)
+    melhor_custo = {}                                           # menor g conhecido para cada estado deste dono
+    remessas = [[] for _ in range(workers)]
+    incrementais, codigo_acao = solucao.sucessores_incrementais, solucao.CODIGO_ACAO
+    empilha, desempilha = heapq.heappush, heapq.heappop
+    estatisticas = {'expandidos': 0, 'gerados': 0, 'duplicados': 0, 'fronteira': 0}
+    limite_superior = math.inf
+
+    def insere(codigo, custo, distancia, caminho):
+        if custo < melhor_custo.get(codigo, custo + 1):
+            melhor_custo[codigo] = custo
+            empilha(abertos, (custo + distancia, -custo, codigo, distancia, caminho))
+            estatisticas['gerados'] += 1
+
+    def recebe(remessa):
+        compartilhado.ociosos[indice] = 0                       # ocupado por qualquer caminho de chegada, antes
+        compartilhado.versoes[indice] += 1                      # de contar a remessa como recebida
+        for nodo in remessa:
+            insere(*nodo)
+        compartilhado.recebidas[indice] += 1
+
+    def envia(destino):
+        compartilhado.enviadas[indice] += 1                    # contada antes de existir, para o término
+        compartilhado.filas[destino].put(remessas[destino])
+        remessas[destino] = []
+
+    codigo_raiz = puzzle.codifica(estado)
+    if dono_do_estado(codigo_raiz, workers) == indice:
+        insere(codigo_raiz, 0, solucao.distancia_por_tabela(codigo_raiz, tabela, puzzle), 0)
+
+    while not compartilhado.parar.value:
+        while True:                                             # remessas que já chegaram
+            try:
+                recebe(fila.get_nowait())
+            except queue.Empty:
+                break
+
+        if len(abertos) > estatisticas['fronteira']:
+            estatisticas['fronteira'] = len(abertos)
+        if compartilhado.melhor_custo.value >= 0:
+            limite_superior = compartilhado.melhor_custo.value
+
+        for _ in range(QUANTUM):
+            if not abertos:
+                break
+            custo_total, negativo_custo, codigo, distancia, caminho = desempilha(abertos)
+            if custo_total >= limite_superior:                  # nenhum nodo restante pode melhorar C
+                abertos.clear()
+                break
+            custo = -negativo_custo
+            if custo > melhor_custo[codigo]:                    # já foi encontrado caminho melhor para o estado
+                estatisticas['duplicados'] += 1
+                continue
+            if codigo == codigo_final:
+                with compartilhado.trava_melhor:
+                    if compartilhado.melhor_custo.value < 0 or custo < compartilhado.melhor_custo.value:
+                        compartilhado.melhor_custo.value = custo
+                        compartilhado.solucoes.put((custo, caminho))
+                limite_superior = compartilhado.melhor_custo.value
+                continue
+
+            estatisticas['expandidos'] += 1
+            custo_vizinho = custo + 1
+            for acao, codigo_vizinho, h_vizinho in incrementais(codigo, distancia, tabela, puzzle):
+                if custo_vizinho + h_vizinho >= limite_superior:
+                    continue
+                caminho_vizinho = (caminho << 2) | codigo_acao[acao]
+                destino = (((codigo_vizinho * MULTIPLICADOR_HASH) & MASCARA_HASH) >> 32) % workers    # dono_do_estado
+                if destino == indice:
+                    insere(codigo_vizinho, custo_vizinho, h_vizinho, caminho_vizinho)
+                else:
+                    remessas[destino].append((codigo_vizinho, custo_vizinho, h_vizinho, caminho_vizinho))
+                    if len(remessas[destino]) >= tamanho_remessa:
+                        envia(destino)
+
+        compartilhado.expandidos[indice] = estatisticas['expandidos']
+        for destino in range(workers):                          # não segura vizinhos enquanto os outros esperam
+            if remessas[destino]:
+                envia(destino)
+
+        if not abertos:                                         # ocioso até chegar uma remessa
+            compartilhado.ociosos[indice] = 1
+            try:
+                remessa = fila.get(timeout=ESPERA_OCIOSO)
+            except queue.Empty:
+                continue
+            recebe(remessa)
+
+    compartilhado.estatisticas.put(estatisticas)
+
+
+def astar_paralelo(estado:str, heuristica:str='manhattan', workers:int=None, tamanho_remessa:int=64,
+                   tempo_limite:float=None, limite_nodos:int=None)->solucao.ResultadoBusca:
+    """
+    Recebe um estado (string), executa a busca A* distribuída por hash (HDA*) em `workers` processos e
+    retorna um ResultadoBusca com a lista de ações de custo ótimo até o objetivo e as estatísticas
+    somadas dos trabalhadores (tamanho_maximo_fronteira é a soma dos máximos de cada um). Caso não haja
+    solução, o caminho é None. Os processos são iniciados a cada chamada, o que só compensa em
+    instâncias difíceis (como as do 15-puzzle).
+    Ao atingir tempo_limite ou limite_nodos (verificado a cada QUANTUM expansões de cada trabalhador),
+    a busca retorna um resultado com esgotado verdadeiro.
+    :param estado: str
+    :param heuristica: str, nome de uma heurística em DefinicaoPuzzle.tabelas
+    :param workers: int, quantidade de processos (os.cpu_count() por padrão)
+    :param tamanho_remessa: int, vizinhos acumulados para um mesmo dono antes do envio
+    :param tempo_limite: float, segundos até a busca ser interrompida (None para sem limite)
+    :param limite_nodos: int, máximo de nodos expandidos antes da interrupção (None para sem limite)
+    :return: ResultadoBusca
+    """
+    limite_busca = solucao.LimiteDeBusca(tempo_limite, limite_nodos)
+    puzzle = solucao.puzzle_do_estado(estado)
+    if heuristica not in puzzle.tabelas:
+        raise ValueError(f"heurística sem tabela incremental: {heuristica}")
+    if not solucao.e_soluvel(estado):
+        return solucao.ResultadoBusca(None, 0, 0, 0, 0)
+    if puzzle.codifica(estado) == puzzle.codigo_final:
+        return solucao.ResultadoBusca([], 0, 1, 0, 1)
+
+    workers = workers or os.cpu_count() or 1
+    contexto = mp.get_context('fork' if 'fork' in mp.get_all_start_methods() else None)
+    compartilhado = _EstadoCompartilhado(contexto, workers)
+    processos = [contexto.Process(target=_trabalhador, args=(indice, estado, heuristica, tamanho_remessa, compartilhado),
+                                  daemon=True)
+                 for indice in range(workers)]
+    for processo in processos:
+        processo.start()
+
+    esgotado = False
+    anterior = None
+    try:
+        while True:                                             # término: duas fotos iguais, todos ociosos e nada em trânsito
+            time.sleep(INTERVALO_COORDENADOR)
+            foto = compartilhado.foto()
+            ociosos, _, enviadas, recebidas = foto
+            if foto == anterior and all(ociosos) and enviadas == recebidas:
+                break
+            anterior = foto
+            if limite_busca.esgotado(sum(compartilhado.expandidos)):
+                esgotado = True
+                break
+    finally:
+        compartilhado.parar.value = 1
+        estatisticas = []
+        for processo in processos:
+            try:
+                estatisticas.append(compartilhado.estatisticas.get(timeout=1))
+            except queue.Empty:
+                break
+        for processo in processos:
+            processo.join(timeout=1)
+            if processo.is_alive():
+                processo.terminate()
+
+    caminho = None
+    if not esgotado:
+        melhor = None
+        while True:                                             # melhorias de trabalhadores diferentes podem chegar fora de ordem
+            try:
+                solucao_recebida = compartilhado.solucoes.get(timeout=0.1 if melhor is None else 0)
+            except queue.Empty:
+                break
+            if melhor is None or solucao_recebida[0] < melhor[0]:
+                melhor = solucao_recebida
+        if melhor is not None:
+            caminho = decodifica_caminho(melhor[1], melhor[0])
+
+    return solucao.ResultadoBusca(caminho,
+                                  sum(contadores['expandidos'] for contadores in estatisticas),
+                                  sum(contadores['gerados'] for contadores in estatisticas),
+                                  sum(contadores['duplicados'] for contadores in estatisticas),
+                                  sum(contadores['fronteira'] for contadores in estatisticas),
+                                  esgotado=esgotado)
+
+
+def astar_paralelo_manhattan(estado:str, workers:int=None)->list[str]:
+    """
+    Recebe um estado (string), executa a busca A* paralela (HDA*) com h(n) = soma das distâncias de
+    Manhattan e retorna uma lista de ações que leva do
+    estado recebido até o objetivo ("12345678_").
+    Caso não haja solução a partir do estado recebido, retorna None
+    :param estado: str
+    :param workers: int, quantidade de processos (os.cpu_count() por padrão)
+    :return:
+    """
+    return astar_paralelo(estado, 'manhattan', workers).caminho
@@ -0,0 +1,170 @@
+"""
+Resolução de estados em fluxo: lê um estado por linha da entrada padrão (ou de um arquivo) e escreve,
+à medida que cada um termina, uma linha JSON com as ações e as estatísticas da busca.
+Uso: python -m eight_puzzle [ARQUIVO] [--algoritmo NOME] [--workers N] [--em-andamento K] [--ordenado]
+                            [--tempo-limite SEGUNDOS] [--limite-nodos N]
+"""
+import argparse
+import functools
+import json
+import math
+import sys
+import time
+import eight_puzzle.lote as lote
+import eight_puzzle.solucao as solucao
+
+# Algoritmos disponíveis: busca de eight_puzzle.solucao e os parâmetros fixos de cada um.
+# As buscas retornam ResultadoBusca e aceitam tempo_limite e limite_nodos; o oráculo retorna a lista de ações.
+BUSCAS = {
+    'astar_hamming': (solucao.astar, {'heuristica': 'hamming'}),
+    'astar_manhattan': (solucao.astar, {'heuristica': 'manhattan'}),
+    'astar_new_heuristic': (solucao.astar, {'heuristica': 'padroes'}),
+    'idastar_manhattan': (solucao.idastar, {'heuristica': 'manhattan'}),
+    'bfs': (solucao.busca_bidirecional, {}),
+    'bfs_lote': (solucao.busca_em_camadas_lote, {}),
+    'feixe_manhattan': (solucao.busca_em_camadas_lote, {'largura': 1000, 'heuristica': 'manhattan'}),
+    'astar_bidirecional_manhattan': (solucao.astar_bidirecional, {'heuristica': 'manhattan'}),
+    'astar_ponderado_manhattan': (solucao.astar, {'heuristica': 'manhattan', 'peso': 2}),
+    'gulosa_manhattan': (solucao.astar, {'heuristica': 'manhattan', 'peso': math.inf}),
+    'ara_manhattan': (solucao.ara_estrela, {'heuristica': 'manhattan'}),
+    'oraculo': (solucao.oraculo, None),
+}
+
+
+def pega_busca(algoritmo:str, tempo_limite:float=None, limite_nodos:int=None)->callable:
+    """
+    Retorna a função estado(str) -> ResultadoBusca (ou list[str]) do algoritmo com os limites recebidos
+    :param algoritmo: str, nome em BUSCAS
+    :param tempo_limite: float, segundos por estado (None para sem limite)
+    :param limite_nodos: int, nodos expandidos por estado (None para sem limite)
+    :return: callable
+    """
+    if algoritmo not in BUSCAS:
+        raise ValueError(f"algoritmo desconhecido: {algoritmo}")
+    busca, parametros = BUSCAS[algoritmo]
+    if parametros is None:
+        return busca
+    return functools.partial(busca, **parametros, tempo_limite=tempo_limite, limite_nodos=limite_nodos)
+
+
+def valida_estado(estado:str)->str:
+    """
+    Retorna a descrição do erro de um estado mal formado, ou None se ele for válido
+    :param estado: str
+    :return: str
+    """
+    try:
+        puzzle = solucao.puzzle_do_estado(estado)
+    except ValueError as erro:
+        return str(erro)
+    if sorted(solucao.separa_pecas(estado)) != sorted(puzzle.simbolos):
+        return f"peças inválidas para o tabuleiro {puzzle.lado}x{puzzle.lado}: {estado}"
+    return None
+
+
+def resolve_entrada(entrada:tuple, busca)->dict:
+    """
+    Recebe uma tupla (número da linha, estado), resolve o estado e retorna o registro a ser escrito
+    :param entrada: Tuple[int, str]
+    :param busca: callable, retornado por pega_busca
+    :return: dict
+    """
+    linha, estado = entrada
+    erro = valida_estado(estado)
+    if erro is not None:
+        return {'linha': linha, 'estado': estado, 'erro': erro}
+
+    inicio = time.perf_counter()
+    try:
+        resposta = busca(estado)
+    except ValueError as erro:                                  # estado não suportado pelo algoritmo
+        return {'linha': linha, 'estado': estado, 'erro': str(erro)}
+    tempo = time.perf_counter() - inicio
+
+    resultado = resposta if isinstance(resposta, solucao.ResultadoBusca) else None
+    caminho = resultado.caminho if resultado is not None else resposta
+    registro = {
+        'linha': linha,
+        'estado': estado,
+        'acoes': caminho,
+        'custo': len(caminho) if caminho is not None else None,
+        'tempo': tempo,
+    }
+    if resultado is not None:
+        registro.update(nodos_expandidos=resultado.nodos_expandidos, nodos_gerados=resultado.nodos_gerados,
+                        duplicados_descartados=resultado.duplicados_descartados,
+                        tamanho_maximo_fronteira=resultado.tamanho_maximo_fronteira, esgotado=resultado.esgotado,
+                        fator_subotimo=None if math.isinf(resultado.fator_subotimo) else resultado.fator_subotimo)
+    return registro
+
+
+def le_entradas(arquivo):
+    """
+    Gera tuplas (número da linha, estado) para as linhas não vazias do arquivo, lidas sob demanda
+    :param arquivo: arquivo de texto aberto
+    :return: Iterator[Tuple[int, str]]
+    """
+    for linha, texto in enumerate(arquivo, 1):
+        estado = texto.strip()
+        if estado:
+            yield linha, estado
+
+
+def resolve_fluxo(entradas, algoritmo:str='astar_manhattan', workers:int=0, em_andamento:int=None,
+                  ordenado:bool=False, tempo_limite:float=None, limite_nodos:int=None):
+    """
+    Resolve as entradas (número da linha, estado) e gera um registro (dict) para cada uma.
+    Sem workers, os estados são resolvidos em ordem no próprio processo. Com workers, são distribuídos
+    a processos trabalhadores (que herdam as tabelas já carregadas) e a entrada só é lida enquanto
+    houver menos de `em_andamento` estados sem resposta escrita.
+    :param entradas: Iterable[Tuple[int, str]]
+    :param algoritmo: str, nome em BUSCAS
+    :param workers: int, quantidade de processos trabalhadores (0 para resolver no próprio processo)
+    :param em_andamento: int, máximo de estados lidos e ainda não escritos (o dobro de workers por padrão)
+    :param ordenado: bool, escreve as respostas na ordem da entrada
+    :param tempo_limite: float, segundos por estado (None para sem limite)
+    :param limite_nodos: int, nodos expandidos por estado (None para sem limite)
+    :return: Iterator[dict]
+    """
+    busca = pega_busca(algoritmo, tempo_limite, limite_nodos)
+
+    if not workers:
+        for entrada in entradas:
+            yield resolve_entrada(entrada, busca)
+        return
+
+    with lote.PoolDeBusca(workers, [algoritmo]) as pool:
+        tarefa = functools.partial(resolve_entrada, busca=busca)
+        for (linha, estado), registro in pool.resolve(entradas, tarefa, unicos=False, ordenado=ordenado,
+                                                      em_andamento=em_andamento):
+            if registro == lote.TRABALHADOR_ENCERRADO:
+                registro = {'linha': linha, 'estado': estado, 'erro': "processo trabalhador encerrado durante a busca"}
+            yield registro
+
+
+def main(argumentos=None)->int:
+    parser = argparse.ArgumentParser(description="Resolve estados do puzzle lidos um por linha, escrevendo JSON por linha")
+    parser.add_argument('arquivo', nargs='?', default='-', help="arquivo com um estado por linha (padrão: entrada padrão)")
+    parser.add_argument('--algoritmo', default='astar_manhattan', choices=list(BUSCAS))
+    parser.add_argument('--workers', type=int, default=0, help="processos trabalhadores (0 para resolver no próprio processo)")
+    parser.add_argument('--em-andamento', type=int, default=None,
+                        help="máximo de estados lidos e ainda não escritos (padrão: o dobro de workers)")
+    parser.add_argument('--ordenado', action='store_true', help="escreve as respostas na ordem da entrada")
+    parser.add_argument('--tempo-limite', type=float, default=None, help="segundos por estado")
+    parser.add_argument('--limite-nodos', type=int, default=None, help="nodos expandidos por estado")
+    argumentos = parser.parse_args(argumentos)
+
+    arquivo = sys.stdin if argumentos.arquivo == '-' else open(argumentos.arquivo)
+    try:
+        for registro in resolve_fluxo(le_entradas(arquivo), argumentos.algoritmo, argumentos.workers,
+                                      argumentos.em_andamento, argumentos.ordenado,
+                                      argumentos.tempo_limite, argumentos.limite_nodos):
+            print(json.dumps(registro, ensure_ascii=False), flush=True)
+    finally:
+        if arquivo is not sys.stdin:
+            arquivo.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
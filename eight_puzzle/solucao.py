@@ -1,6 +1,17 @@
 from typing import Iterable, Set, Tuple
+from array import array
+from collections import OrderedDict, deque
+from fractions import Fraction
 import numpy as np
+import cProfile
+import functools
 import heapq
+import math
+import mmap
+import os
+import pstats
+import time
+import tracemalloc
 
 class DadosSolucaoPuzzle:
     estado_final = "12345678_"
@@ -25,10 +36,12 @@ class Nodo:
     """
     Implemente a classe Nodo com os atributos descritos na funcao init
     """
+    __slots__ = ('estado', 'pai', 'acao', 'custo')
+
     def __init__(self, estado:str, pai, acao:str, custo:int):
         """
         Inicializa o nodo com os atributos recebidos
-        :param estado:str, representacao do estado do 8-puzzle
+        :param estado:str, representacao do estado do 8-puzzle (ou seu código inteiro, dentro do A* genérico)
         :param pai:Nodo, referencia ao nodo pai, (None no caso do nó raiz)
         :param acao:str, acao a partir do pai que leva a este nodo (None no caso do nó raiz)
         :param custo:int, custo do caminho da raiz até este nó
@@ -55,6 +68,506 @@ class Nodo:
     
     
 
+# Definição do puzzle e codificação inteira dos estados ===========
+# Um DefinicaoPuzzle reúne tudo que depende do lado N do tabuleiro: o estado final, o formato
+# em string, a codificação inteira e as tabelas de movimentos e de heurísticas.
+# Até o 3x3 cada peça é um caractere ("12345678_"); nos tabuleiros maiores as peças são
+# separadas por espaços ("1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 _").
+# Na codificação inteira cada posição ocupa bits_por_posicao bits (0 representa o vazio) e os
+# bits acima das peças guardam a posição do vazio, para não ter que procurá-lo a cada expansão.
+def separa_pecas(estado:str)->list[str]:
+    """
+    Recebe um estado (string) e retorna a lista com o símbolo de cada posição
+    :param estado: str
+    :return: list[str]
+    """
+    return estado.split() if ' ' in estado else list(estado)
+
+class DefinicaoPuzzle:
+    """
+    Dados e tabelas do puzzle de lado N (N*N - 1 peças)
+    """
+    def __init__(self, lado:int):
+        """
+        Deriva do lado do tabuleiro o estado final, a codificação e as tabelas de movimentos e heurísticas
+        :param lado: int
+        """
+        self.lado = lado
+        self.numero_posicoes = lado * lado
+        self.bits_por_posicao = max(4, (self.numero_posicoes - 1).bit_length())
+        self.mascara_posicao = (1 << self.bits_por_posicao) - 1
+        self.deslocamento_vazio = self.bits_por_posicao * self.numero_posicoes
+        self.bits_codigo = self.deslocamento_vazio + (self.numero_posicoes - 1).bit_length()
+        self.simbolos = ('_',) + tuple(str(valor) for valor in range(1, self.numero_posicoes))
+        self.valor_simbolo = {simbolo: valor for valor, simbolo in enumerate(self.simbolos)}
+        self.separador = '' if self.numero_posicoes <= 10 else ' '
+        self.estado_final = self.formata(self.simbolos[1:] + ('_',))
+
+        self.tabela_movimentos = gera_tabela_movimentos(self)
+        self.codigo_final = self.codifica(self.estado_final)
+
+        # Simetria pela diagonal principal: a posição (linha, coluna) vai para (coluna, linha) e cada peça
+        # é trocada pela peça cuja posição final é a transposta da sua, o que leva o estado final nele mesmo
+        self.posicao_transposta = tuple((posicao % lado) * lado + posicao // lado for posicao in range(self.numero_posicoes))
+        self.valor_transposto = (0,) + tuple(self.posicao_transposta[valor - 1] + 1 for valor in range(1, self.numero_posicoes))
+        self.tabelas = {
+            'manhattan': gera_tabela_manhattan(self),
+            'hamming': gera_tabela_hamming(self),
+        }
+
+    def formata(self, pecas:Iterable[str])->str:
+        """
+        Recebe os símbolos de cada posição e retorna o estado (string)
+        :param pecas: Iterable[str]
+        :return: str
+        """
+        return self.separador.join(pecas)
+
+    def codifica(self, estado:str)->int:
+        """
+        Recebe um estado (string) e retorna sua representação inteira
+        :param estado: str
+        :return: int
+        """
+        pecas = separa_pecas(estado)
+        codigo = pecas.index('_') << self.deslocamento_vazio
+
+        for posicao, simbolo in enumerate(pecas):
+            codigo |= self.valor_simbolo[simbolo] << (self.bits_por_posicao * posicao)
+
+        return codigo
+
+    def decodifica(self, codigo:int)->str:
+        """
+        Recebe a representação inteira de um estado e retorna o estado (string)
+        :param codigo: int
+        :return: str
+        """
+        return self.formata(self.simbolos[(codigo >> (self.bits_por_posicao * posicao)) & self.mascara_posicao]
+                            for posicao in range(self.numero_posicoes))
+
+    def transpoe(self, codigo:int)->int:
+        """
+        Recebe a representação inteira de um estado e retorna a do estado espelhado pela diagonal
+        principal. As soluções dos dois estados diferem apenas pela troca acima/esquerda e abaixo/direita
+        :param codigo: int
+        :return: int
+        """
+        transposto = self.posicao_transposta[codigo >> self.deslocamento_vazio] << self.deslocamento_vazio
+        for posicao in range(self.numero_posicoes):
+            valor = (codigo >> (self.bits_por_posicao * posicao)) & self.mascara_posicao
+            transposto |= self.valor_transposto[valor] << (self.bits_por_posicao * self.posicao_transposta[posicao])
+        return transposto
+
+    def __str__(self):
+        return f"DefinicaoPuzzle ({self.lado}x{self.lado}, estado final: {self.estado_final})"
+
+def gera_tabela_movimentos(puzzle:DefinicaoPuzzle=None)->tuple:
+    """
+    Gera a tabela que associa cada posição do vazio aos movimentos possíveis a partir dela.
+    Cada movimento é uma tupla (acao, nova_posicao_vazio, deslocamento_origem,
+    deslocamento_destino, delta_vazio), onde os deslocamentos são os bits da peça movida antes
+    e depois do movimento e delta_vazio é o valor a somar no campo da posição do vazio.
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :return: tuple
+    """
+    puzzle = puzzle or OITO_PUZZLE
+    lado = puzzle.lado
+    tabela = []
+
+    for posicao in range(puzzle.numero_posicoes):
+        linha, coluna = divmod(posicao, lado)
+        destinos = []
+
+        # Mesma ordem de ações de pega_acoes_possiveis
+        if linha > 0:
+            destinos.append(('acima', posicao - lado))
+        if coluna > 0:
+            destinos.append(('esquerda', posicao - 1))
+        if linha < lado - 1:
+            destinos.append(('abaixo', posicao + lado))
+        if coluna < lado - 1:
+            destinos.append(('direita', posicao + 1))
+
+        movimentos = []
+        for acao, nova_posicao in destinos:
+            movimentos.append((
+                acao,
+                nova_posicao,
+                puzzle.bits_por_posicao * nova_posicao,                 # a peça sai da nova posição do vazio
+                puzzle.bits_por_posicao * posicao,                      # e vai para a posição antiga do vazio
+                (nova_posicao - posicao) << puzzle.deslocamento_vazio,
+            ))
+        tabela.append(tuple(movimentos))
+
+    return tuple(tabela)
+
+# Tabelas das heurísticas ===========
+# TABELA[valor][posicao] é a contribuição da peça `valor` na `posicao` para a heurística.
+# O vazio não contribui, o que mantém as heurísticas admissíveis e permite atualizá-las
+# em O(1) a cada movimento, olhando apenas a peça movida.
+def gera_tabela_manhattan(puzzle:DefinicaoPuzzle=None, estado_alvo:str=None)->tuple:
+    """
+    Gera a tabela com a distância de Manhattan de cada peça em cada posição até sua posição final
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :param estado_alvo: str, estado cujas posições são as finais (estado final do puzzle por padrão)
+    :return: tuple
+    """
+    puzzle = puzzle or OITO_PUZZLE
+    estado_final = separa_pecas(estado_alvo or puzzle.estado_final)
+    tabela = []
+
+    for valor, simbolo in enumerate(puzzle.simbolos):
+        linha_final, coluna_final = divmod(estado_final.index(simbolo), puzzle.lado)
+        distancias = []
+        for posicao in range(puzzle.numero_posicoes):
+            linha, coluna = divmod(posicao, puzzle.lado)
+            distancias.append(0 if valor == 0 else abs(linha_final - linha) + abs(coluna_final - coluna))
+        tabela.append(tuple(distancias))
+
+    return tuple(tabela)
+
+def gera_tabela_hamming(puzzle:DefinicaoPuzzle=None, estado_alvo:str=None)->tuple:
+    """
+    Gera a tabela que indica (1) se cada peça em cada posição está fora de sua posição final
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :param estado_alvo: str, estado cujas posições são as finais (estado final do puzzle por padrão)
+    :return: tuple
+    """
+    puzzle = puzzle or OITO_PUZZLE
+    estado_final = separa_pecas(estado_alvo or puzzle.estado_final)
+    tabela = []
+
+    for valor, simbolo in enumerate(puzzle.simbolos):
+        posicao_final = estado_final.index(simbolo)
+        tabela.append(tuple(int(valor != 0 and posicao != posicao_final) for posicao in range(puzzle.numero_posicoes)))
+
+    return tuple(tabela)
+
+PUZZLES = {}                                    # definições já criadas, por lado
+
+def pega_puzzle(lado:int)->DefinicaoPuzzle:
+    """
+    Retorna a definição do puzzle de lado recebido, criando-a apenas no primeiro uso
+    :param lado: int
+    :return: DefinicaoPuzzle
+    """
+    if lado < 2:
+        raise ValueError(f"lado do tabuleiro inválido: {lado}")
+    if lado not in PUZZLES:
+        PUZZLES[lado] = DefinicaoPuzzle(lado)
+    return PUZZLES[lado]
+
+def puzzle_do_estado(estado:str)->DefinicaoPuzzle:
+    """
+    Recebe um estado (string) e retorna a definição do puzzle do tamanho correspondente
+    :param estado: str
+    :return: DefinicaoPuzzle
+    """
+    quantidade = len(estado) if ' ' not in estado else len(estado.split())
+    lado = math.isqrt(quantidade)
+    if lado * lado != quantidade:
+        raise ValueError(f"o estado {estado} não representa um tabuleiro quadrado")
+    return PUZZLES.get(lado) or pega_puzzle(lado)
+
+OITO_PUZZLE = pega_puzzle(3)
+
+# Atalhos para o 8-puzzle (3x3)
+NUMERO_POSICOES = OITO_PUZZLE.numero_posicoes
+BITS_POR_POSICAO = OITO_PUZZLE.bits_por_posicao
+MASCARA_POSICAO = OITO_PUZZLE.mascara_posicao
+SIMBOLOS = OITO_PUZZLE.simbolos                 # símbolo de cada valor codificado (índice = valor)
+
+def codifica_estado(estado:str, puzzle:DefinicaoPuzzle=None)->int:
+    """
+    Recebe um estado (string) e retorna sua representação inteira
+    :param estado: str
+    :param puzzle: DefinicaoPuzzle (deduzido do estado por padrão)
+    :return: int
+    """
+    return (puzzle or puzzle_do_estado(estado)).codifica(estado)
+
+def decodifica_estado(codigo:int, puzzle:DefinicaoPuzzle=None)->str:
+    """
+    Recebe a representação inteira de um estado e retorna o estado (string)
+    :param codigo: int
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :return: str
+    """
+    return (puzzle or OITO_PUZZLE).decodifica(codigo)
+
+def posicao_vazio_codificado(codigo:int, puzzle:DefinicaoPuzzle=None)->int:
+    """
+    Recebe a representação inteira de um estado e retorna a posição do espaço vazio
+    :param codigo: int
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :return: int
+    """
+    return codigo >> (puzzle or OITO_PUZZLE).deslocamento_vazio
+
+def sucessores_codificados(codigo:int, puzzle:DefinicaoPuzzle=None)->list[Tuple[str,int]]:
+    """
+    Recebe a representação inteira de um estado e retorna uma lista de tuplas
+    (ação, código do estado atingido), usando apenas consultas à tabela de movimentos.
+    :param codigo: int
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :return: list[Tuple[str,int]]
+    """
+    puzzle = puzzle or OITO_PUZZLE
+    mascara = puzzle.mascara_posicao
+    resultado = []
+
+    for acao, _, deslocamento_origem, deslocamento_destino, delta_vazio in puzzle.tabela_movimentos[codigo >> puzzle.deslocamento_vazio]:
+        peca = (codigo >> deslocamento_origem) & mascara
+        resultado.append((acao, codigo - (peca << deslocamento_origem) + (peca << deslocamento_destino) + delta_vazio))
+
+    return resultado
+
+def e_soluvel(estado:str, colunas:int=None, estado_final:str=None)->bool:
+    """
+    Recebe um estado (string) e retorna se o objetivo é alcançável a partir dele, em O(n).
+    Cada movimento é uma transposição (inverte a paridade da permutação que leva o estado ao
+    objetivo) e muda em 1 a distância de Manhattan do vazio até sua posição final; como ambas
+    são nulas no objetivo, o estado tem solução sse as duas paridades coincidem. O critério vale
+    para tabuleiros N×M com qualquer estado final.
+    :param estado: str
+    :param colunas: int, largura do tabuleiro (lado do tabuleiro quadrado por padrão)
+    :param estado_final: str, objetivo (estado final do puzzle quadrado por padrão)
+    :return: bool
+    """
+    pecas = separa_pecas(estado)
+    if estado_final is None or colunas is None:
+        puzzle = puzzle_do_estado(estado)
+        estado_final = estado_final or puzzle.estado_final
+        colunas = colunas or puzzle.lado
+    pecas_finais = separa_pecas(estado_final)
+    if sorted(pecas) != sorted(pecas_finais):                           # peças diferentes das do objetivo
+        return False
+
+    posicao_final = {simbolo: posicao for posicao, simbolo in enumerate(pecas_finais)}
+    destino = [posicao_final[simbolo] for simbolo in pecas]
+
+    # paridade da permutação = (n - número de ciclos) mod 2
+    visitados = [False] * len(destino)
+    ciclos = 0
+    for inicio in range(len(destino)):
+        if not visitados[inicio]:
+            ciclos += 1
+            posicao = inicio
+            while not visitados[posicao]:
+                visitados[posicao] = True
+                posicao = destino[posicao]
+    paridade_permutacao = (len(destino) - ciclos) % 2
+
+    linha, coluna = divmod(pecas.index('_'), colunas)
+    linha_final, coluna_final = divmod(posicao_final['_'], colunas)
+    paridade_vazio = (abs(linha - linha_final) + abs(coluna - coluna_final)) % 2
+
+    return paridade_permutacao == paridade_vazio
+
+def distancia_por_tabela(codigo:int, tabela:tuple, puzzle:DefinicaoPuzzle=None)->int:
+    """
+    Recebe a representação inteira de um estado e uma tabela de heurística e retorna
+    a soma das contribuições de todas as peças
+    :param codigo: int
+    :param tabela: tuple
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :return: int
+    """
+    puzzle = puzzle or OITO_PUZZLE
+    bits, mascara = puzzle.bits_por_posicao, puzzle.mascara_posicao
+    distancia = 0
+
+    for posicao in range(puzzle.numero_posicoes):
+        distancia += tabela[(codigo >> (bits * posicao)) & mascara][posicao]
+
+    return distancia
+
+def sucessores_incrementais(codigo:int, distancia:int, tabela:tuple, puzzle:DefinicaoPuzzle=None)->list[Tuple[str,int,int]]:
+    """
+    Recebe a representação inteira de um estado, o valor da heurística nesse estado e a tabela da
+    heurística e retorna uma lista de tuplas (ação, código do estado atingido, heurística do estado atingido).
+    A heurística de cada sucessor é obtida em O(1) a partir da contribuição da única peça movida.
+    :param codigo: int
+    :param distancia: int
+    :param tabela: tuple
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :return: list[Tuple[str,int,int]]
+    """
+    puzzle = puzzle or OITO_PUZZLE
+    mascara = puzzle.mascara_posicao
+    resultado = []
+    posicao_vazia = codigo >> puzzle.deslocamento_vazio
+
+    for acao, nova_posicao, deslocamento_origem, deslocamento_destino, delta_vazio in puzzle.tabela_movimentos[posicao_vazia]:
+        peca = (codigo >> deslocamento_origem) & mascara
+        contribuicao = tabela[peca]
+        resultado.append((
+            acao,
+            codigo - (peca << deslocamento_origem) + (peca << deslocamento_destino) + delta_vazio,
+            distancia - contribuicao[nova_posicao] + contribuicao[posicao_vazia],
+        ))
+
+    return resultado
+
+# Armazenamento dos nodos gerados pelas buscas ===========
+# As buscas guardam os nodos através de um armazém: adiciona() devolve uma referência ao nodo e
+# as demais operações recebem essa referência. ArmazemDeObjetos usa objetos Nodo; ArmazemDeNodos
+# guarda cada campo em um array paralelo e a referência é o índice do nodo nesses arrays.
+# O armazém também define a entrada da fronteira (heap) de cada nodo: entradas com o mesmo f
+# são retiradas na ordem de inserção.
+ACOES = ('acima', 'esquerda', 'abaixo', 'direita')
+CODIGO_ACAO = {acao: codigo for codigo, acao in enumerate(ACOES)}
+SEM_PAI = -1
+
+class ArmazemDeObjetos:
+    """
+    Armazém de nodos em que cada nodo é um objeto Nodo
+    """
+    def __init__(self, puzzle:DefinicaoPuzzle=None):
+        self.contador = 0                                           # desempate entre entradas com o mesmo f
+
+    def adiciona(self, estado, pai, acao:str, custo:int)->Nodo:
+        """
+        Cria um nodo e retorna sua referência (o próprio Nodo)
+        :param estado: código inteiro do estado
+        :param pai: referência do nodo pai (None no caso do nó raiz)
+        :param acao: str, acao a partir do pai (None no caso do nó raiz)
+        :param custo: int, custo do caminho da raiz até este nó
+        :return: Nodo
+        """
+        return Nodo(estado, pai, acao, custo)
+
+    def estado(self, nodo:Nodo):
+        return nodo.estado
+
+    def custo(self, nodo:Nodo)->int:
+        return nodo.custo
+
+    def trilha(self, nodo:Nodo)->list[str]:
+        return trilha_de_estados_a_partir_da_raiz(nodo)
+
+    def entrada(self, custo_total:int, nodo:Nodo)->tuple:
+        self.contador += 1
+        return (custo_total, self.contador, nodo)
+
+    def abre_entrada(self, entrada:tuple)->Tuple[int, Nodo]:
+        return entrada[0], entrada[2]
+
+class ArmazemDeNodos:
+    """
+    Armazém de nodos em arrays paralelos (estado codificado, índice do pai, código da ação e custo),
+    que ocupa alguns bytes por nodo em vez de um objeto por nodo. Nos tabuleiros cujo código não
+    cabe em 64 bits (a partir do 4x4) os estados ficam em uma lista comum.
+    """
+    def __init__(self, puzzle:DefinicaoPuzzle=None):
+        self.estados = array('Q') if (puzzle or OITO_PUZZLE).bits_codigo <= 64 else []
+        self.pais = array('l')
+        self.acoes = array('b')
+        self.custos = array('H')
+
+    def adiciona(self, estado:int, pai:int, acao:str, custo:int)->int:
+        """
+        Cria um nodo e retorna sua referência (o índice do nodo nos arrays)
+        :param estado: int, código inteiro do estado
+        :param pai: int, índice do nodo pai (None no caso do nó raiz)
+        :param acao: str, acao a partir do pai (None no caso do nó raiz)
+        :param custo: int, custo do caminho da raiz até este nó
+        :return: int
+        """
+        self.estados.append(estado)
+        self.pais.append(SEM_PAI if pai is None else pai)
+        self.acoes.append(SEM_PAI if acao is None else CODIGO_ACAO[acao])
+        self.custos.append(custo)
+        return len(self.estados) - 1
+
+    def estado(self, indice:int)->int:
+        return self.estados[indice]
+
+    def custo(self, indice:int)->int:
+        return self.custos[indice]
+
+    def trilha(self, indice:int)->list[str]:
+        return trilha_de_estados_a_partir_da_raiz(indice, self)
+
+    def entrada(self, custo_total:int, indice:int)->int:
+        return (custo_total << 32) | indice                        # um único inteiro ordenado por (f, índice)
+
+    def abre_entrada(self, entrada:int)->Tuple[int, int]:
+        return entrada >> 32, entrada & 0xffffffff
+
+ARMAZENS = {
+    'objetos': ArmazemDeObjetos,
+    'arrays': ArmazemDeNodos,
+}
+
+# Fronteiras (listas abertas) das buscas ===========
+# Guardam as entradas criadas pelo armazém de nodos (ArmazemDeObjetos.entrada / ArmazemDeNodos.entrada)
+# e as retiram em ordem de menor f. Todas têm a mesma interface: insere(f, g, entrada), retira() e len().
+class FronteiraHeap:
+    """
+    Fronteira em heap binário: O(log n) por operação; empates em f são resolvidos pela própria entrada
+    (ordem de criação dos nodos)
+    """
+    def __init__(self):
+        self.entradas = []
+
+    def insere(self, f:int, g:int, entrada):
+        heapq.heappush(self.entradas, entrada)
+
+    def retira(self):
+        return heapq.heappop(self.entradas)
+
+    def __len__(self):
+        return len(self.entradas)
+
+class FronteiraDeBaldes:
+    """
+    Fronteira em baldes para f inteiro e limitado: baldes[f][g] é uma pilha (LIFO) de entradas, e em um
+    mesmo f sai primeiro o maior g (o nodo mais próximo do objetivo segundo a heurística).
+    Inserir e retirar custam O(1) amortizado: o menor f só anda para frente, exceto quando uma
+    heurística inconsistente insere um f menor, e as pilhas vazias no fim de cada balde são removidas
+    para que baldes[f][-1] seja sempre a pilha do maior g
+    """
+    def __init__(self):
+        self.baldes = []
+        self.menor_f = 0
+        self.tamanho = 0
+
+    def insere(self, f:int, g:int, entrada):
+        baldes = self.baldes
+        while len(baldes) <= f:
+            baldes.append([])
+        balde = baldes[f]
+        while len(balde) <= g:
+            balde.append([])
+        balde[g].append(entrada)
+        if f < self.menor_f or self.tamanho == 0:
+            self.menor_f = f
+        self.tamanho += 1
+
+    def retira(self):
+        if self.tamanho == 0:
+            raise IndexError("retirada de fronteira vazia")
+        balde = self.baldes[self.menor_f]
+        while not balde:
+            self.menor_f += 1
+            balde = self.baldes[self.menor_f]
+        pilha = balde[-1]
+        entrada = pilha.pop()
+        while balde and not balde[-1]:
+            balde.pop()
+        self.tamanho -= 1
+        return entrada
+
+    def __len__(self):
+        return self.tamanho
+
+FRONTEIRAS = {
+    'heap': FronteiraHeap,
+    'baldes': FronteiraDeBaldes,
+}
+
 def sucessor(estado:str)->Set[Tuple[str,str]]:
     """
     Recebe um estado (string) e retorna um conjunto de tuplas (ação,estado atingido)
@@ -73,15 +586,8 @@ def sucessor(estado:str)->Set[Tuple[str,str]]:
     # 10 11 12
     # 20 21 22
 
-    possiveis_acoes = pega_acoes_possiveis(estado)
-    acoes_e_estados = []
-
-    for acao in possiveis_acoes:
-        novo_estado = altera_estado(estado, acao)
-        tupla_acao_estado = (acao, novo_estado)
-        acoes_e_estados.append(tupla_acao_estado)
-    
-    return set(acoes_e_estados)
+    puzzle = puzzle_do_estado(estado)
+    return {(acao, puzzle.decodifica(codigo)) for acao, codigo in sucessores_codificados(puzzle.codifica(estado), puzzle)}
 
 def pega_acoes_possiveis(estado:str)->list[str]:
     """
@@ -89,42 +595,16 @@ def pega_acoes_possiveis(estado:str)->list[str]:
     :param estado: str
     :return: list[str]
     """
-    # Inicializa o conjunto de ações possíveis
-    possiveis_acoes = ['acima', 'esquerda', 'abaixo', 'direita']
-    tabuleiro = estado_string_para_matriz(estado)
-    posicao_vazia = np.where(tabuleiro == '_')
-    linha_posicao_vazia = posicao_vazia[0]
-    coluna_posicao_vazia = posicao_vazia[1]
-
-    # Remove as ações que não são possíveis
-    if (linha_posicao_vazia == 0):
-        possiveis_acoes.remove('acima')
-    if (coluna_posicao_vazia == 0):
-        possiveis_acoes.remove('esquerda')
-    if (linha_posicao_vazia == 2):
-        possiveis_acoes.remove('abaixo')
-    if (coluna_posicao_vazia == 2):
-        possiveis_acoes.remove('direita')
-
-    return possiveis_acoes
+    return [movimento[0] for movimento in puzzle_do_estado(estado).tabela_movimentos[separa_pecas(estado).index('_')]]
 
 def estado_string_para_matriz(estado:str)->np.array:
     """
-    Recebe um estado (string) e retorna um numpy array 3x3 com o estado
+    Recebe um estado (string) e retorna um numpy array NxN com o estado
     :param estado: str
     :return: np.array
     """
-    # Separa o estado do tabuleiro em 3 linhas ['123', '456', '789']
-    linhas_do_tabuleiro = [estado[i:i+3] for i in range(0, len(estado), 3)] 
-    tabuleiro = np.empty((3, 3), dtype=str)
-
-    for linha_do_tabuleiro in linhas_do_tabuleiro:
-        for elemento in linha_do_tabuleiro:
-            index_linha = linhas_do_tabuleiro.index(linha_do_tabuleiro)
-            index_coluna = linha_do_tabuleiro.index(elemento)
-            tabuleiro[index_linha][index_coluna] = elemento
-
-    return tabuleiro
+    lado = puzzle_do_estado(estado).lado
+    return np.array(separa_pecas(estado), dtype=str).reshape(lado, lado)
 
 def altera_estado(estado:str, acao:str)->str:
     """
@@ -134,10 +614,16 @@ def altera_estado(estado:str, acao:str)->str:
     :param acao: str
     :return: str
     """
-    tabuleiro = estado_string_para_matriz(estado)
-    tabuleiro_resultante = mover_vazio_na_matriz(tabuleiro, acao)
+    puzzle = puzzle_do_estado(estado)
+    tabuleiro = separa_pecas(estado)
+    posicao_vazia = tabuleiro.index('_')
+
+    for acao_possivel, nova_posicao, _, _, _ in puzzle.tabela_movimentos[posicao_vazia]:
+        if acao_possivel == acao:
+            tabuleiro[posicao_vazia], tabuleiro[nova_posicao] = tabuleiro[nova_posicao], '_'
+            return puzzle.formata(tabuleiro)
 
-    return estado_matriz_para_string(tabuleiro_resultante)
+    raise ValueError(f"ação {acao} inválida para o estado {estado}")
 
 def mover_vazio_na_matriz(tabuleiro:np.array, acao:str)->np.array:
     """
@@ -175,7 +661,7 @@ def estado_matriz_para_string(tabuleiro:np.array)->str:
     :param estado: np.array
     :return: str
     """
-    return ''.join(tabuleiro.flatten().tolist())
+    return pega_puzzle(len(tabuleiro)).formata(tabuleiro.flatten().tolist())
 
 def expande(nodo:Nodo)->Set[Nodo]:
     """
@@ -193,6 +679,102 @@ def expande(nodo:Nodo)->Set[Nodo]:
 
     return sucessores
 
+# Cache de soluções ===========
+# Ação equivalente no estado espelhado pela diagonal principal (DefinicaoPuzzle.transpoe)
+ACAO_TRANSPOSTA = {'acima': 'esquerda', 'esquerda': 'acima', 'abaixo': 'direita', 'direita': 'abaixo'}
+
+class CacheDeSolucoes:
+    """
+    Cache LRU de soluções ótimas, com no máximo `capacidade` estados. A chave de cada estado é a
+    forma canônica da sua representação inteira (a menor entre ela e a do estado espelhado), então
+    a solução de um estado também responde pelo seu espelho. Ao guardar uma solução, todos os estados
+    do caminho são guardados apontando para o mesmo caminho, cada um com o seu sufixo.
+    """
+    def __init__(self, capacidade:int=100000):
+        """
+        :param capacidade: int, quantidade máxima de estados guardados
+        """
+        self.capacidade = capacidade
+        self.entradas = OrderedDict()           # (nome, código canônico) -> (caminho, início do sufixo)
+        self.acertos = 0
+        self.falhas = 0
+
+    def consulta(self, nome:str, estado:str)->list[str]:
+        """
+        Retorna a solução guardada para o estado (ou para o seu espelho) na busca `nome`, ou None
+        :param nome: str, nome da busca
+        :param estado: str
+        :return: list[str]
+        """
+        puzzle = puzzle_do_estado(estado)
+        codigo = puzzle.codifica(estado)
+        canonico = min(codigo, puzzle.transpoe(codigo))
+        entrada = self.entradas.get((nome, canonico))
+        if entrada is None:
+            self.falhas += 1
+            return None
+
+        self.entradas.move_to_end((nome, canonico))
+        self.acertos += 1
+        caminho, inicio = entrada
+        if canonico == codigo:
+            return list(caminho[inicio:])
+        return [ACAO_TRANSPOSTA[acao] for acao in caminho[inicio:]]
+
+    def guarda(self, nome:str, estado:str, caminho:list[str]):
+        """
+        Guarda a solução ótima do estado e, com os sufixos dela, a de cada estado do caminho
+        :param nome: str, nome da busca
+        :param estado: str
+        :param caminho: list[str], ações do estado até o objetivo
+        """
+        puzzle = puzzle_do_estado(estado)
+        caminho = tuple(caminho)
+        transposto = tuple(ACAO_TRANSPOSTA[acao] for acao in caminho)
+        codigos = [puzzle.codifica(estado)]
+        for acao in caminho:
+            codigos.append(dict(sucessores_codificados(codigos[-1], puzzle))[acao])
+
+        for inicio in range(len(caminho), -1, -1):                     # o estado recebido fica como o mais recente
+            codigo = codigos[inicio]
+            espelho = puzzle.transpoe(codigo)
+            if codigo <= espelho:
+                self.entradas[(nome, codigo)] = (caminho, inicio)
+                self.entradas.move_to_end((nome, codigo))
+            else:
+                self.entradas[(nome, espelho)] = (transposto, inicio)
+                self.entradas.move_to_end((nome, espelho))
+
+        while len(self.entradas) > self.capacidade:
+            self.entradas.popitem(last=False)
+
+    def limpa(self):
+        """
+        Remove todas as soluções guardadas
+        """
+        self.entradas.clear()
+        self.acertos = self.falhas = 0
+
+CACHE_SOLUCOES = CacheDeSolucoes()
+
+def em_cache(busca):
+    """
+    Decorador das buscas ótimas que retornam lista de ações: consulta CACHE_SOLUCOES antes de buscar
+    e guarda nele as soluções encontradas
+    :param busca: callable, função estado(str) -> list[str]
+    :return: callable
+    """
+    @functools.wraps(busca)
+    def busca_em_cache(estado:str)->list[str]:
+        caminho = CACHE_SOLUCOES.consulta(busca.__name__, estado)
+        if caminho is None:
+            caminho = busca(estado)
+            if caminho is not None:
+                CACHE_SOLUCOES.guarda(busca.__name__, estado, caminho)
+        return caminho
+    return busca_em_cache
+
+@em_cache
 def astar_hamming(estado:str)->list[str]:
     """
     Recebe um estado (string), executa a busca A* com h(n) = soma das distâncias de Hamming e
@@ -202,52 +784,36 @@ def astar_hamming(estado:str)->list[str]:
     :param estado: str
     :return:
     """
-    # Seguindo a nomenclatura de variáveis descrita no exercício nos comentários
-    estados_explorados = set()                                          # conjunto de estados explorados X
-    nodo_raiz = Nodo(estado, None, None, 0)                             # estado inicial s
-    custo_hamming = funcao_de_custo_hamming(nodo_raiz)                  # custo de h(v) para o estado inicial
-    heap_id = 0                                                         # id para cada valor da heap ser único
-    tupla_custo_hamming_nodo = (custo_hamming, heap_id, nodo_raiz)
-    fronteira = []                                                      # inicialização da fronteira F
-    heapq.heappush(fronteira, tupla_custo_hamming_nodo)
-    nodos_expandidos = 0
-
-    while len(fronteira) != 0:                                          # enquanto houver nodos na fronteira
-        tupla_custo_hamming_nodo = fronteira[0]
-        heapq.heappop(fronteira)
-        nodo_fronteira = tupla_custo_hamming_nodo[2]                    # pega o primeiro nodo v da fronteira
+    return astar(estado, 'hamming').caminho
 
-        if nodo_fronteira.estado == DadosSolucaoPuzzle.estado_final:    # se o estado do nodo é o estado final, retorna o caminho percorrido
-            return trilha_de_estados_a_partir_da_raiz(nodo_fronteira)
-        
-        estados_explorados.add(nodo_fronteira.estado)                   # adiciona o estado aos explorados
-        nodos_vizinhos = expande(nodo_fronteira)                        # expande o nodo e retorna os vizinhos
-        nodos_expandidos += 1                                           # atualiza o contados de nós expandidos
-
-        for vizinho in nodos_vizinhos:                                  # para cada vizinho u do nodo
-            if vizinho.estado not in estados_explorados:                # se o vizinho não estiver nos nodos já explorados
-                custo_hamming = funcao_de_custo_hamming(vizinho)        # calcula o custo de hamming do vizinho
-                heap_id += 1                                            # cria o id único do heap para o vizinho
-                tupla_custo_hamming_nodo = (custo_hamming, heap_id, vizinho)
-                heapq.heappush(fronteira, tupla_custo_hamming_nodo)     # adiciona o vizinho a fronteira                     
-
-    return None                                                         # retorna falha
-
-def trilha_de_estados_a_partir_da_raiz(nodo:Nodo)->list[str]:
+def trilha_de_estados_a_partir_da_raiz(nodo:Nodo, armazem:ArmazemDeNodos=None)->list[str]:
     """
     Recebe um nodo (objeto da classe Nodo) e retorna uma lista de ações que leva do
     nodo raiz até o nodo de entrada.
-    :param nodo: objeto da classe Nodo
+    Se um ArmazemDeNodos for informado, o nodo é o seu índice no armazém e a trilha é
+    reconstruída pelos índices dos pais.
+    :param nodo: objeto da classe Nodo (ou índice no armazém)
+    :param armazem: ArmazemDeNodos
     :return: list[str]
     """
     trilha = []
+
+    if armazem is not None:
+        indice = nodo
+        while armazem.pais[indice] != SEM_PAI:                  # sobe pelos índices dos pais até a raiz
+            trilha.append(ACOES[armazem.acoes[indice]])
+            indice = armazem.pais[indice]
+        trilha.reverse()
+        return trilha
+
     nodo_atual = nodo
 
     while nodo_atual.pai != None:         # faz um loop que pega o pai dos nodos até chegar na raiz
         acao_atual = nodo_atual.acao
-        trilha.insert(0, acao_atual)      # salva o valor da ação na trilha
+        trilha.append(acao_atual)         # salva o valor da ação na trilha
         nodo_atual = nodo_atual.pai       # atualiza o valor atual do nodo para o pai do nodo analizado
 
+    trilha.reverse()                      # as ações foram salvas do nodo até a raiz
     return trilha
 
 def funcao_de_custo_hamming(nodo:Nodo)->int:
@@ -261,21 +827,15 @@ def funcao_de_custo_hamming(nodo:Nodo)->int:
 
 def distancia_hamming(estado:str)->int:
     """
-    Recebe um estado (string) e retorna a distância de Hamming calculada a partir das distâncias dos dígitos
+    Recebe um estado (string) e retorna a distância de Hamming: a quantidade de peças (sem contar
+    o espaço vazio) fora de sua posição final
     :param estado: str
     :return: int
     """
-    distancia = 0
-
-    if estado == DadosSolucaoPuzzle.estado_final:              # se o estado for o final, a distância é 0
-        return distancia
-    
-    for i in range(len(estado)):                               # senão verifica se cada dígito é diferente do estado final
-        if estado[i] != DadosSolucaoPuzzle.estado_final[i]:
-            distancia += 1
-
-    return distancia
+    puzzle = puzzle_do_estado(estado)
+    return distancia_por_tabela(puzzle.codifica(estado), puzzle.tabelas['hamming'], puzzle)
 
+@em_cache
 def astar_manhattan(estado:str)->list[str]:
     """
     Recebe um estado (string), executa a busca A* com h(n) = soma das distâncias de Manhattan e
@@ -285,36 +845,7 @@ def astar_manhattan(estado:str)->list[str]:
     :param estado: str
     :return:
     """
-    # Seguindo a nomenclatura de variáveis descrita no exercício nos comentários
-    estados_explorados = set()                                          # conjunto de estados explorados X
-    nodo_raiz = Nodo(estado, None, None, 0)                             # estado inicial s
-    custo_manhattan = funcao_de_custo_manhattan(nodo_raiz)              # custo de h(v) para o estado inicial
-    heap_id = 0                                                         # id para cada valor da heap ser único
-    tupla_custo_manhattan_nodo = (custo_manhattan, heap_id, nodo_raiz)
-    fronteira = []                                                      # inicialização da fronteira F
-    heapq.heappush(fronteira, tupla_custo_manhattan_nodo)
-    nodos_expandidos = 0
-
-    while len(fronteira) != 0:                                          # enquanto houver nodos na fronteira
-        tupla_custo_manhattan_nodo = fronteira[0]
-        heapq.heappop(fronteira)
-        nodo_fronteira = tupla_custo_manhattan_nodo[2]                  # pega o primeiro nodo v da fronteira
-
-        if nodo_fronteira.estado == DadosSolucaoPuzzle.estado_final:    # se o estado do nodo é o estado final, retorna o caminho percorrido
-            return trilha_de_estados_a_partir_da_raiz(nodo_fronteira)
-        
-        estados_explorados.add(nodo_fronteira.estado)                   # adiciona o estado aos explorados
-        nodos_vizinhos = expande(nodo_fronteira)                        # expande o nodo e retorna os vizinhos
-        nodos_expandidos += 1                                           # atualiza o contados de nós expandidos
-
-        for vizinho in nodos_vizinhos:                                  # para cada vizinho u do nodo
-            if vizinho.estado not in estados_explorados:                # se o vizinho não estiver nos nodos já explorados
-                custo_manhattan = funcao_de_custo_manhattan(vizinho)    # calcula o custo de hamming do vizinho
-                heap_id += 1                                            # cria o id único do heap para o vizinho
-                tupla_custo_manhattan_nodo = (custo_manhattan, heap_id, vizinho)
-                heapq.heappush(fronteira, tupla_custo_manhattan_nodo)   # adiciona o vizinho a fronteira                     
-
-    return None                                                         # retorna falha
+    return astar(estado, 'manhattan').caminho
 
 def funcao_de_custo_manhattan(nodo:Nodo)->int:
     """
@@ -328,58 +859,1494 @@ def funcao_de_custo_manhattan(nodo:Nodo)->int:
 def distancia_manhattan(estado:str)->int:
     """
     Recebe um estado (string) e retorna a distância de Manhattan calculada a partir de quantos movimentos
-    horizontais e verticais são necessários para chegar à posição correta
+    horizontais e verticais são necessários para levar cada peça (sem contar o espaço vazio) à posição correta
     :param estado: str
     :return: int
     """
-    distancia_total = 0
+    puzzle = puzzle_do_estado(estado)
+    return distancia_por_tabela(puzzle.codifica(estado), puzzle.tabelas['manhattan'], puzzle)
+
+def distancia_conflito_linear(estado:str)->int:
+    """
+    Recebe um estado (string) e retorna a distância de Manhattan somada a 2 movimentos para cada par
+    de peças em conflito linear (duas peças na sua linha/coluna final, mas em ordem invertida)
+    :param estado: str
+    :return: int
+    """
+    puzzle = puzzle_do_estado(estado)
+    lado = puzzle.lado
+    pecas = separa_pecas(estado)
+    posicoes_finais = {simbolo: divmod(posicao, lado) for posicao, simbolo in enumerate(separa_pecas(puzzle.estado_final))}
+    distancia_total = distancia_manhattan(estado)
+
+    for indice in range(lado):
+        linha = [posicoes_finais[v][1] for v in pecas[indice * lado:(indice + 1) * lado]
+                 if v != '_' and posicoes_finais[v][0] == indice]
+        coluna = [posicoes_finais[v][0] for v in pecas[indice::lado]
+                  if v != '_' and posicoes_finais[v][1] == indice]
+
+        for destinos in (linha, coluna):                                # cada par fora de ordem custa 2 movimentos extras
+            for i in range(len(destinos)):
+                for j in range(i + 1, len(destinos)):
+                    if destinos[i] > destinos[j]:
+                        distancia_total += 2
 
-    if estado == DadosSolucaoPuzzle.estado_final:                               # se o estado for o final, a distância é 0
-        return distancia_total
-    
-    matriz_estado = estado_string_para_matriz(estado)                           # transforma numa matriz para calcular a distância em dosi eixos
-    DadosSolucaoPuzzle.gera_dicionario_estado_final()                           # gera o dicionário com a posição de cada valor na matriz final
-
-    for i in range(len(matriz_estado)):                                         # itera sobre as linhas e colunas da matriz do estado atual
-        for j in range(len(matriz_estado[i])):
-            valor_atual = matriz_estado[i][j]
-            valor_final = DadosSolucaoPuzzle.matriz_estado_final[i][j]
-
-            if valor_atual != valor_final:                                                      # compara o valor atual com o valor final
-                i_final, j_final = DadosSolucaoPuzzle.valor_posicao_estado_final[valor_atual]   # se forem diferentes, pega a posição do valor atual na matriz final
-                distancia_valor = abs(i_final - i) + abs(j_final - j)                           # e calcula a distância de manhattan
-                distancia_total += distancia_valor                                              # soma a distância total
-                
     return distancia_total
 
-# Não preenchidos ===========
-def bfs(estado:str)->list[str]:
+# Banco de padrões disjuntos ===========
+# Cada padrão é um conjunto de peças; a tabela do padrão guarda, para cada posicionamento dessas
+# peças (ranqueado como permutação parcial), o mínimo de movimentos DAS PEÇAS DO PADRÃO para
+# levá-las às posições finais. Como os padrões são disjuntos e só contam movimentos das próprias
+# peças, a soma das tabelas é admissível. As tabelas ficam em disco (um byte por posicionamento)
+# e são mapeadas em memória com mmap. PADROES_DISJUNTOS é a partição padrão do 3x3; para outros
+# tamanhos os padrões devem ser informados explicitamente.
+PADROES_DISJUNTOS = ((1, 2, 3, 4), (5, 6, 7, 8))
+DIRETORIO_TABELAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tabelas')
+
+def tamanho_tabela_padrao(quantidade_pecas:int, numero_posicoes:int=NUMERO_POSICOES)->int:
     """
-    Recebe um estado (string), executa a busca em LARGURA e
-    retorna uma lista de ações que leva do
-    estado recebido até o objetivo ("12345678_").
-    Caso não haja solução a partir do estado recebido, retorna None
-    :param estado: str
-    :return:
+    Recebe a quantidade de peças de um padrão e retorna o número de posicionamentos possíveis
+    dessas peças no tabuleiro
+    :param quantidade_pecas: int
+    :param numero_posicoes: int, posições do tabuleiro
+    :return: int
     """
-    # substituir a linha abaixo pelo seu codigo
-    raise NotImplementedError
+    tamanho = 1
+    for i in range(quantidade_pecas):
+        tamanho *= numero_posicoes - i
+    return tamanho
 
-def dfs(estado:str)->list[str]:
+def rank_posicoes(posicoes:Iterable[int], numero_posicoes:int=NUMERO_POSICOES)->int:
     """
-    Recebe um estado (string), executa a busca em PROFUNDIDADE e
-    retorna uma lista de ações que leva do
-    estado recebido até o objetivo ("12345678_").
-    Caso não haja solução a partir do estado recebido, retorna None
-    :param estado: str
-    :return:
+    Recebe as posições das peças de um padrão (na ordem das peças) e retorna o índice do
+    posicionamento na tabela do padrão (rank da permutação parcial)
+    :param posicoes: Iterable[int]
+    :param numero_posicoes: int, posições do tabuleiro
+    :return: int
     """
-    # substituir a linha abaixo pelo seu codigo
-    raise NotImplementedError
+    rank = 0
+    anteriores = []
 
-def astar_new_heuristic(estado:str)->list[str]:
+    for i, posicao in enumerate(posicoes):
+        menores = 0
+        for anterior in anteriores:              # desconta as posições já ocupadas por peças anteriores
+            if anterior < posicao:
+                menores += 1
+        rank = rank * (numero_posicoes - i) + posicao - menores
+        anteriores.append(posicao)
+
+    return rank
+
+def gera_tabela_padrao(padrao:Tuple[int, ...], puzzle:DefinicaoPuzzle=None)->bytearray:
+    """
+    Recebe um padrão (tupla de valores de peças) e gera sua tabela por busca em largura 0-1 para trás
+    a partir do estado final: mover uma peça do padrão custa 1 e mover qualquer outra peça custa 0.
+    :param padrao: Tuple[int, ...]
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :return: bytearray, com um byte por posicionamento ranqueado das peças do padrão
+    """
+    puzzle = puzzle or OITO_PUZZLE
+    estado_final = separa_pecas(puzzle.estado_final)
+    posicoes_iniciais = tuple(estado_final.index(puzzle.simbolos[valor]) for valor in padrao)
+    inicio = (posicoes_iniciais, estado_final.index('_'))
+
+    tabela = bytearray(b'\xff' * tamanho_tabela_padrao(len(padrao), puzzle.numero_posicoes))
+    distancias = {inicio: 0}
+    fila = deque([inicio])
+
+    while fila:
+        estado_abstrato = fila.popleft()
+        posicoes, posicao_vazia = estado_abstrato
+        distancia = distancias[estado_abstrato]
+
+        rank = rank_posicoes(posicoes, puzzle.numero_posicoes)
+        if distancia < tabela[rank]:
+            tabela[rank] = distancia
+
+        for movimento in puzzle.tabela_movimentos[posicao_vazia]:
+            nova_posicao = movimento[1]
+            if nova_posicao in posicoes:                                    # move uma peça do padrão: custo 1
+                indice = posicoes.index(nova_posicao)
+                vizinho = (posicoes[:indice] + (posicao_vazia,) + posicoes[indice + 1:], nova_posicao)
+                custo = distancia + 1
+            else:                                                           # move uma peça fora do padrão: custo 0
+                vizinho = (posicoes, nova_posicao)
+                custo = distancia
+
+            if custo < distancias.get(vizinho, custo + 1):
+                distancias[vizinho] = custo
+                if custo == distancia:
+                    fila.appendleft(vizinho)
+                else:
+                    fila.append(vizinho)
+
+    return tabela
+
+def caminho_tabela_padrao(padrao:Tuple[int, ...], diretorio:str=None, puzzle:DefinicaoPuzzle=None)->str:
+    """
+    Recebe um padrão e retorna o caminho do arquivo de sua tabela
+    :param padrao: Tuple[int, ...]
+    :param diretorio: str, diretório das tabelas (DIRETORIO_TABELAS por padrão)
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :return: str
+    """
+    lado = (puzzle or OITO_PUZZLE).lado
+    nome = f"padrao_{lado}x{lado}_{'-'.join(str(valor) for valor in padrao)}.bin"
+    return os.path.join(diretorio or DIRETORIO_TABELAS, nome)
+
+def salva_tabela(caminho:str, tabela:bytes):
+    """
+    Escreve uma tabela em disco de forma atômica (arquivo temporário seguido de renomeação)
+    :param caminho: str
+    :param tabela: bytes
+    """
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    caminho_temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(caminho_temporario, 'wb') as arquivo:
+        arquivo.write(tabela)
+    os.replace(caminho_temporario, caminho)
+
+def mapeia_tabela(caminho:str, tamanho:int)->mmap.mmap:
+    """
+    Mapeia em memória (somente leitura) uma tabela salva em disco.
+    Retorna None se o arquivo não existir ou não tiver o tamanho esperado.
+    :param caminho: str
+    :param tamanho: int, tamanho esperado em bytes
+    :return: mmap.mmap
+    """
+    if not os.path.exists(caminho) or os.path.getsize(caminho) != tamanho:
+        return None
+    with open(caminho, 'rb') as arquivo:
+        return mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+def carrega_tabela_padrao(padrao:Tuple[int, ...], diretorio:str=None, regerar:bool=False,
+                          puzzle:DefinicaoPuzzle=None)->mmap.mmap:
+    """
+    Recebe um padrão e retorna sua tabela mapeada em memória, gerando e salvando o arquivo
+    caso ele não exista (ou se regerar for verdadeiro)
+    :param padrao: Tuple[int, ...]
+    :param diretorio: str, diretório das tabelas (DIRETORIO_TABELAS por padrão)
+    :param regerar: bool, gera a tabela novamente mesmo que o arquivo já exista
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :return: mmap.mmap
+    """
+    puzzle = puzzle or OITO_PUZZLE
+    caminho = caminho_tabela_padrao(padrao, diretorio, puzzle)
+    tamanho = tamanho_tabela_padrao(len(padrao), puzzle.numero_posicoes)
+    tabela = None if regerar else mapeia_tabela(caminho, tamanho)
+
+    if tabela is None:
+        salva_tabela(caminho, gera_tabela_padrao(padrao, puzzle))
+        tabela = mapeia_tabela(caminho, tamanho)
+
+    return tabela
+
+class BancoDePadroes:
+    """
+    Heurística aditiva de padrões disjuntos sobre a representação inteira dos estados
+    """
+    def __init__(self, padroes:Tuple[Tuple[int, ...], ...]=None, diretorio:str=None, regerar:bool=False,
+                 puzzle:DefinicaoPuzzle=None):
+        """
+        Carrega (ou gera) as tabelas de cada padrão
+        :param padroes: tupla de padrões disjuntos, cada um uma tupla de valores de peças
+                        (PADROES_DISJUNTOS por padrão, apenas no 3x3)
+        :param diretorio: str, diretório das tabelas (DIRETORIO_TABELAS por padrão)
+        :param regerar: bool, gera as tabelas novamente mesmo que os arquivos já existam
+        :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+        """
+        self.puzzle = puzzle or OITO_PUZZLE
+        if padroes is None:
+            if self.puzzle is not OITO_PUZZLE:
+                raise ValueError(f"não há padrões disjuntos padrão para o tabuleiro {self.puzzle.lado}x{self.puzzle.lado}")
+            padroes = PADROES_DISJUNTOS
+        self.padroes = padroes
+        self.tabelas = [carrega_tabela_padrao(padrao, diretorio, regerar, self.puzzle) for padrao in padroes]
+
+    def distancia(self, codigo:int)->int:
+        """
+        Recebe a representação inteira de um estado e retorna a soma das distâncias dos padrões
+        :param codigo: int
+        :return: int
+        """
+        puzzle = self.puzzle
+        posicao_da_peca = [0] * puzzle.numero_posicoes
+        for posicao in range(puzzle.numero_posicoes):
+            posicao_da_peca[(codigo >> (puzzle.bits_por_posicao * posicao)) & puzzle.mascara_posicao] = posicao
+
+        distancia = 0
+        for padrao, tabela in zip(self.padroes, self.tabelas):
+            distancia += tabela[rank_posicoes([posicao_da_peca[valor] for valor in padrao], puzzle.numero_posicoes)]
+
+        return distancia
+
+_bancos_de_padroes = {}
+
+def pega_banco_de_padroes(puzzle:DefinicaoPuzzle=None)->BancoDePadroes:
+    """
+    Retorna o banco de padrões padrão do puzzle, carregando suas tabelas apenas no primeiro uso
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :return: BancoDePadroes
     """
-    Recebe um estado (string), executa a busca A* com h(n) = sua nova heurística e
+    puzzle = puzzle or OITO_PUZZLE
+    if puzzle.lado not in _bancos_de_padroes:
+        _bancos_de_padroes[puzzle.lado] = BancoDePadroes(puzzle=puzzle)
+    return _bancos_de_padroes[puzzle.lado]
+
+def distancia_banco_de_padroes(estado:str)->int:
+    """
+    Recebe um estado (string) e retorna a heurística de padrões disjuntos
+    :param estado: str
+    :return: int
+    """
+    return pega_banco_de_padroes().distancia(OITO_PUZZLE.codifica(estado))
+
+# Operações em lote (NumPy) ===========
+# Um lote de estados é um array (n, numero_posicoes) de uint8 com o valor de cada posição (0 para o vazio).
+# As funções abaixo operam sobre o lote inteiro de uma vez, sem laços em Python por estado.
+
+def tabuleiros_de_estados(estados:Iterable[str], puzzle:DefinicaoPuzzle=None)->np.ndarray:
+    """
+    Recebe estados (string) e retorna o lote correspondente
+    :param estados: Iterable[str]
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :return: np.ndarray, (n, numero_posicoes) uint8
+    """
+    puzzle = puzzle or OITO_PUZZLE
+    tabuleiros = [[puzzle.valor_simbolo[simbolo] for simbolo in separa_pecas(estado)] for estado in estados]
+    return np.array(tabuleiros, dtype=np.uint8).reshape(-1, puzzle.numero_posicoes)
+
+def estados_de_tabuleiros(tabuleiros:np.ndarray, puzzle:DefinicaoPuzzle=None)->list[str]:
+    """
+    Recebe um lote e retorna os estados (string) correspondentes
+    :param tabuleiros: np.ndarray, (n, numero_posicoes) uint8
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :return: list[str]
+    """
+    puzzle = puzzle or OITO_PUZZLE
+    return [puzzle.formata(puzzle.simbolos[valor] for valor in linha) for linha in tabuleiros.tolist()]
+
+def distancia_por_tabela_lote(tabuleiros:np.ndarray, tabela:tuple)->np.ndarray:
+    """
+    Recebe um lote e uma tabela de heurística (tabela[valor][posicao]) e retorna a heurística de cada estado
+    :param tabuleiros: np.ndarray, (n, numero_posicoes) uint8
+    :param tabela: tuple, tabela de DefinicaoPuzzle.tabelas
+    :return: np.ndarray, (n,) int
+    """
+    tabela = np.array(tabela, dtype=np.int16)
+    return tabela[tabuleiros, np.arange(tabuleiros.shape[1])].sum(axis=1)
+
+def distancia_manhattan_lote(tabuleiros:np.ndarray, puzzle:DefinicaoPuzzle=None)->np.ndarray:
+    """
+    Recebe um lote e retorna a soma das distâncias de Manhattan de cada estado (como distancia_manhattan)
+    :param tabuleiros: np.ndarray, (n, numero_posicoes) uint8
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :return: np.ndarray, (n,) int
+    """
+    return distancia_por_tabela_lote(tabuleiros, (puzzle or OITO_PUZZLE).tabelas['manhattan'])
+
+def distancia_hamming_lote(tabuleiros:np.ndarray, puzzle:DefinicaoPuzzle=None)->np.ndarray:
+    """
+    Recebe um lote e retorna a distância de Hamming de cada estado (como distancia_hamming)
+    :param tabuleiros: np.ndarray, (n, numero_posicoes) uint8
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :return: np.ndarray, (n,) int
+    """
+    return distancia_por_tabela_lote(tabuleiros, (puzzle or OITO_PUZZLE).tabelas['hamming'])
+
+def sucessores_lote(tabuleiros:np.ndarray, puzzle:DefinicaoPuzzle=None)->Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Recebe um lote e retorna os sucessores de todos os seus estados, agrupados por ação na ordem de ACOES
+    :param tabuleiros: np.ndarray, (n, numero_posicoes) uint8
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :return: Tuple[np.ndarray, np.ndarray, np.ndarray], (sucessores, índice do pai no lote, código da ação)
+    """
+    puzzle = puzzle or OITO_PUZZLE
+    destinos = np.full((len(ACOES), puzzle.numero_posicoes), -1, dtype=np.intp)   # nova posição do vazio por ação
+    for posicao, movimentos in enumerate(puzzle.tabela_movimentos):
+        for acao, nova_posicao, _, _, _ in movimentos:
+            destinos[CODIGO_ACAO[acao], posicao] = nova_posicao
+
+    vazios = np.argmin(tabuleiros, axis=1)
+    sucessores, pais, acoes = [], [], []
+    for codigo_acao in range(len(ACOES)):
+        destino = destinos[codigo_acao][vazios]
+        validos = np.flatnonzero(destino >= 0)
+        filhos = tabuleiros[validos]
+        linhas = np.arange(len(validos))
+        origem, destino = vazios[validos], destino[validos]
+        filhos[linhas, origem] = filhos[linhas, destino]            # a peça vai para a posição antiga do vazio
+        filhos[linhas, destino] = 0
+        sucessores.append(filhos)
+        pais.append(validos)
+        acoes.append(np.full(len(validos), codigo_acao, dtype=np.int8))
+
+    return np.concatenate(sucessores), np.concatenate(pais), np.concatenate(acoes)
+
+def chaves_lote(tabuleiros:np.ndarray, puzzle:DefinicaoPuzzle=None)->np.ndarray:
+    """
+    Recebe um lote e retorna a representação inteira das peças de cada estado (o código de codifica_estado
+    sem o campo da posição do vazio), usada para comparar estados entre lotes
+    :param tabuleiros: np.ndarray, (n, numero_posicoes) uint8, com as peças cabendo em 64 bits
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :return: np.ndarray, (n,) uint64
+    """
+    bits = (puzzle or OITO_PUZZLE).bits_por_posicao
+    numero_posicoes = tabuleiros.shape[1]
+    if numero_posicoes * bits > 64:
+        raise ValueError(f"chaves em lote suportam tabuleiros de até {64 // bits} posições")
+    deslocamentos = np.arange(numero_posicoes, dtype=np.uint64) * np.uint64(bits)
+    return np.bitwise_or.reduce(tabuleiros.astype(np.uint64) << deslocamentos, axis=1)
+
+def codigos_lote(tabuleiros:np.ndarray, puzzle:DefinicaoPuzzle=None)->list[int]:
+    """
+    Recebe um lote e retorna a representação inteira de cada estado (como codifica_estado)
+    :param tabuleiros: np.ndarray, (n, numero_posicoes) uint8
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :return: list[int]
+    """
+    puzzle = puzzle or OITO_PUZZLE
+    vazios = np.argmax(tabuleiros == 0, axis=1)
+    return [int(chave) | (int(vazio) << puzzle.deslocamento_vazio)
+            for chave, vazio in zip(chaves_lote(tabuleiros, puzzle), vazios)]
+
+def proxima_camada_lote(tabuleiros:np.ndarray, chaves_anteriores:np.ndarray, puzzle:DefinicaoPuzzle=None)->tuple:
+    """
+    Expande uma camada e retorna os sucessores inéditos: sem repetições e sem os estados de chaves_anteriores
+    :param tabuleiros: np.ndarray, lote da camada atual
+    :param chaves_anteriores: np.ndarray, chaves (sem repetições) dos estados já vistos
+    :param puzzle: DefinicaoPuzzle (3x3 por padrão)
+    :return: tuple, (sucessores, chaves, índice do pai na camada, código da ação, quantidade de gerados descartados)
+    """
+    filhos, pais, acoes = sucessores_lote(tabuleiros, puzzle)
+    chaves, indices = np.unique(chaves_lote(filhos, puzzle), return_index=True)
+    ineditos = ~np.isin(chaves, chaves_anteriores, assume_unique=True)
+    indices = indices[ineditos]
+    return filhos[indices], chaves[ineditos], pais[indices], acoes[indices], len(filhos) - len(indices)
+
+def rank_lote(tabuleiros:np.ndarray)->np.ndarray:
+    """
+    Recebe um lote e retorna o rank da permutação de cada estado (como rank_estado)
+    :param tabuleiros: np.ndarray, (n, numero_posicoes) uint8
+    :return: np.ndarray, (n,) int64
+    """
+    numero_posicoes = tabuleiros.shape[1]
+    ranks = np.zeros(len(tabuleiros), dtype=np.int64)
+    for i in range(numero_posicoes):
+        menores = (tabuleiros[:, :i] < tabuleiros[:, i:i + 1]).sum(axis=1)  # desconta as peças anteriores menores
+        ranks = ranks * (numero_posicoes - i) + tabuleiros[:, i] - menores
+    return ranks
+
+# Oráculo de distâncias exatas ===========
+# Tabela com a distância exata até o objetivo de todos os estados, indexada pelo rank da permutação
+# das peças (um byte por permutação, SEM_SOLUCAO para os estados da outra classe de paridade).
+# Com ela, qualquer estado é resolvido descendo gulosamente pelas distâncias, sem busca.
+# Só é viável no 3x3 (9! bytes; o 4x4 precisaria de 16! bytes).
+SEM_SOLUCAO = 0xff
+
+def rank_estado(codigo:int)->int:
+    """
+    Recebe a representação inteira de um estado e retorna o rank da permutação de suas peças
+    :param codigo: int
+    :return: int
+    """
+    return rank_posicoes([(codigo >> (BITS_POR_POSICAO * posicao)) & MASCARA_POSICAO
+                          for posicao in range(NUMERO_POSICOES)])
+
+def gera_tabela_distancias()->bytearray:
+    """
+    Gera a tabela de distâncias exatas por busca em largura em lote a partir do estado final.
+    Como o grafo não é direcionado, os sucessores de uma camada só podem repetir estados da própria
+    camada ou da anterior, então só as chaves dessas duas camadas são guardadas
+    :return: bytearray, com um byte por permutação das peças
+    """
+    tabela = np.full(tamanho_tabela_padrao(NUMERO_POSICOES), SEM_SOLUCAO, dtype=np.uint8)
+    camada = tabuleiros_de_estados([DadosSolucaoPuzzle.estado_final])
+    chaves = chaves_lote(camada)
+    chaves_anterior = chaves[:0]
+    distancia = 0
+
+    while len(camada):                                              # percorre o espaço camada por camada
+        tabela[rank_lote(camada)] = distancia
+        vistas = np.concatenate((chaves_anterior, chaves))
+        chaves_anterior = chaves
+        camada, chaves, _, _, _ = proxima_camada_lote(camada, vistas)
+        distancia += 1
+
+    return bytearray(tabela.tobytes())
+
+def caminho_tabela_distancias(diretorio:str=None)->str:
+    """
+    Retorna o caminho do arquivo da tabela de distâncias exatas
+    :param diretorio: str, diretório das tabelas (DIRETORIO_TABELAS por padrão)
+    :return: str
+    """
+    return os.path.join(diretorio or DIRETORIO_TABELAS, f"distancias_{DadosSolucaoPuzzle.estado_final}.bin")
+
+def carrega_tabela_distancias(diretorio:str=None, regerar:bool=False)->mmap.mmap:
+    """
+    Retorna a tabela de distâncias exatas mapeada em memória, gerando e salvando o arquivo
+    caso ele não exista (ou se regerar for verdadeiro)
+    :param diretorio: str, diretório das tabelas (DIRETORIO_TABELAS por padrão)
+    :param regerar: bool, gera a tabela novamente mesmo que o arquivo já exista
+    :return: mmap.mmap
+    """
+    caminho = caminho_tabela_distancias(diretorio)
+    tamanho = tamanho_tabela_padrao(NUMERO_POSICOES)
+    tabela = None if regerar else mapeia_tabela(caminho, tamanho)
+
+    if tabela is None:
+        salva_tabela(caminho, gera_tabela_distancias())
+        tabela = mapeia_tabela(caminho, tamanho)
+
+    return tabela
+
+class Oraculo:
+    """
+    Resolve estados por consulta à tabela de distâncias exatas
+    """
+    def __init__(self, diretorio:str=None, regerar:bool=False):
+        """
+        Carrega (ou gera) a tabela de distâncias exatas
+        :param diretorio: str, diretório das tabelas (DIRETORIO_TABELAS por padrão)
+        :param regerar: bool, gera a tabela novamente mesmo que o arquivo já exista
+        """
+        self.tabela = carrega_tabela_distancias(diretorio, regerar)
+
+    def distancia(self, codigo:int)->int:
+        """
+        Recebe a representação inteira de um estado e retorna sua distância exata até o objetivo,
+        ou None caso não haja solução
+        :param codigo: int
+        :return: int
+        """
+        distancia = self.tabela[rank_estado(codigo)]
+        return None if distancia == SEM_SOLUCAO else distancia
+
+    def resolve(self, estado:str)->list[str]:
+        """
+        Recebe um estado (string) e retorna uma lista ótima de ações até o objetivo, escolhendo a cada
+        passo um sucessor com distância uma unidade menor. Caso não haja solução, retorna None.
+        Uma tabela em que nenhum sucessor tem a distância seguinte (corrompida) gera ValueError
+        :param estado: str
+        :return: list[str]
+        """
+        if puzzle_do_estado(estado) is not OITO_PUZZLE:
+            raise ValueError("o oráculo só resolve estados do 3x3")
+        codigo = OITO_PUZZLE.codifica(estado)
+        distancia = self.distancia(codigo)
+        if distancia is None:
+            return None
+
+        caminho = []
+        while distancia > 0:
+            for acao, vizinho in sucessores_codificados(codigo):
+                if self.tabela[rank_estado(vizinho)] == distancia - 1:
+                    caminho.append(acao)
+                    codigo = vizinho
+                    distancia -= 1
+                    break
+            else:
+                raise ValueError("tabela de distâncias inconsistente")
+
+        return caminho
+
+_oraculo = None
+
+def pega_oraculo()->Oraculo:
+    """
+    Retorna o oráculo padrão, carregando sua tabela apenas no primeiro uso
+    :return: Oraculo
+    """
+    global _oraculo
+    if _oraculo is None:
+        _oraculo = Oraculo()
+    return _oraculo
+
+def oraculo(estado:str)->list[str]:
+    """
+    Recebe um estado (string) e retorna uma lista ótima de ações que leva do estado recebido até
+    o objetivo ("12345678_"), consultando a tabela de distâncias exatas em vez de buscar.
+    Caso não haja solução a partir do estado recebido, retorna None
+    :param estado: str
+    :return: list[str]
+    """
+    return pega_oraculo().resolve(estado)
+
+# Resultado das buscas ===========
+class ResultadoBusca:
+    """
+    Resultado de uma busca: o caminho encontrado (None caso não haja solução) e as estatísticas da busca.
+    Uma busca interrompida pelo LimiteDeBusca tem caminho None, esgotado verdadeiro e as estatísticas
+    até o momento da interrupção (exceto o ARA*, que devolve a melhor solução encontrada até então).
+    fator_subotimo limita o custo do caminho em relação ao ótimo: custo <= fator_subotimo * custo ótimo
+    (1 nas buscas ótimas, math.inf quando não há garantia)
+    """
+    def __init__(self, caminho:list[str], nodos_expandidos:int, nodos_gerados:int,
+                 duplicados_descartados:int, tamanho_maximo_fronteira:int, esgotado:bool=False,
+                 fator_subotimo:float=1.0):
+        """
+        :param caminho: list[str], ações da raiz até o objetivo (None caso não haja solução)
+        :param nodos_expandidos: int, quantidade de nodos retirados da fronteira e expandidos
+        :param nodos_gerados: int, quantidade de nodos inseridos na fronteira
+        :param duplicados_descartados: int, entradas da fronteira ignoradas por já haver caminho melhor para o estado
+        :param tamanho_maximo_fronteira: int, maior tamanho que a fronteira atingiu
+        :param esgotado: bool, a busca parou por ter esgotado o tempo ou a quantidade de nodos permitida
+        :param fator_subotimo: float, razão máxima entre o custo do caminho e o custo ótimo
+        """
+        self.caminho = caminho
+        self.nodos_expandidos = nodos_expandidos
+        self.nodos_gerados = nodos_gerados
+        self.duplicados_descartados = duplicados_descartados
+        self.tamanho_maximo_fronteira = tamanho_maximo_fronteira
+        self.esgotado = esgotado
+        self.fator_subotimo = fator_subotimo
+
+    def __str__(self):
+        custo = len(self.caminho) if self.caminho is not None else None
+        esgotado = ", esgotado" if self.esgotado else ""
+        subotimo = f", fator subotimo: {self.fator_subotimo:g}" if self.fator_subotimo != 1 else ""
+        return (f"ResultadoBusca (custo: {custo}, expandidos: {self.nodos_expandidos}, "
+                f"gerados: {self.nodos_gerados}, duplicados: {self.duplicados_descartados}, "
+                f"fronteira maxima: {self.tamanho_maximo_fronteira}{esgotado}{subotimo})")
+
+class LimiteDeBusca:
+    """
+    Limite de tempo e de nodos expandidos verificado pelas buscas dentro do próprio laço.
+    As buscas guardam em uma variável local o número de expansões da próxima verificação (proxima)
+    e só chamam esgotado ao atingi-lo: sem limites ele é infinito, e com limite de tempo o relógio
+    é consultado a cada INTERVALO expansões
+    """
+    INTERVALO = 1024
+
+    def __init__(self, tempo_limite:float=None, limite_nodos:int=None):
+        """
+        :param tempo_limite: float, segundos a partir da criação do limite (None para sem limite)
+        :param limite_nodos: int, máximo de nodos expandidos (None para sem limite)
+        """
+        self.prazo = time.monotonic() + tempo_limite if tempo_limite is not None else None
+        self.limite_nodos = limite_nodos
+        self.proxima = self.calcula_proxima(0)
+
+    def calcula_proxima(self, nodos_expandidos:int)->float:
+        """
+        Retorna o número de expansões em que o limite deve ser verificado novamente
+        :param nodos_expandidos: int
+        :return: float
+        """
+        proxima = nodos_expandidos + self.INTERVALO if self.prazo is not None else math.inf
+        if self.limite_nodos is not None:
+            proxima = min(proxima, self.limite_nodos)
+        return proxima
+
+    def esgotado(self, nodos_expandidos:int)->bool:
+        """
+        Retorna verdadeiro se o limite foi atingido; senão atualiza self.proxima
+        :param nodos_expandidos: int
+        :return: bool
+        """
+        if self.limite_nodos is not None and nodos_expandidos >= self.limite_nodos:
+            return True
+        if self.prazo is not None and time.monotonic() >= self.prazo:
+            return True
+        self.proxima = self.calcula_proxima(nodos_expandidos)
+        return False
+
+# Instrumentação ===========
+# Fases medidas separadamente. No modo incremental a heurística é atualizada junto com a geração dos
+# vizinhos, então seu tempo entra em 'sucessores'.
+FASES = ('sucessores', 'heuristica', 'fronteira')
+
+class MonitorDeBusca:
+    """
+    Coleta as estatísticas de uma busca: os contadores do ResultadoBusca, o tempo total e o tempo de
+    cada fase (FASES), o pico de memória alocada (tracemalloc) e um perfil (cProfile), além de chamar
+    ao_expandir a cada estado expandido.
+    As buscas só envolvem suas funções internas quando recebem um monitor, escolhendo-as uma única
+    vez antes do laço; sem monitor o laço executado é o mesmo de sempre.
+    O IDA* altera o tabuleiro no lugar, sem funções de sucessores ou fronteira, e por isso informa
+    apenas os contadores, o tempo total, a memória e o perfil.
+    """
+    def __init__(self, tempos:bool=True, memoria:bool=False, perfil:bool=False, ao_expandir=None):
+        """
+        :param tempos: bool, mede o tempo gasto em cada fase
+        :param memoria: bool, mede o pico de memória alocada durante a busca
+        :param perfil: bool, perfila a busca com cProfile
+        :param ao_expandir: callable, chamada com o código (int) de cada estado expandido
+        """
+        self.medir_tempos = tempos
+        self.medir_memoria = memoria
+        self.ao_expandir = ao_expandir
+        self.perfil = cProfile.Profile() if perfil else None
+        self.tempos = dict.fromkeys(FASES, 0.0)
+        self.tempo_total = 0.0
+        self.pico_memoria = None
+        self.resultado = None
+        self._inicio = None
+        self._memoria_inicial = 0
+        self._parar_tracemalloc = False
+
+    def envolve(self, fase:str, funcao, expandidos=None)->callable:
+        """
+        Recebe uma função de uma fase da busca e retorna a função a ser usada no laço: a própria
+        função, ou uma que acumula seu tempo em self.tempos[fase]. Em 'sucessores', que é chamada
+        uma vez por expansão com o código do estado, também chama ao_expandir com esse código
+        :param fase: str, nome em FASES
+        :param funcao: callable
+        :param expandidos: callable, recebe os argumentos de `funcao` e retorna os códigos expandidos
+                           (para funções que expandem vários estados por chamada; por padrão o primeiro argumento)
+        :return: callable
+        """
+        if self.medir_tempos:
+            medida, tempos, relogio = funcao, self.tempos, time.perf_counter
+            def funcao(*argumentos):
+                inicio = relogio()
+                retorno = medida(*argumentos)
+                tempos[fase] += relogio() - inicio
+                return retorno
+
+        if fase == 'sucessores' and self.ao_expandir is not None:
+            expandida, ao_expandir = funcao, self.ao_expandir
+            if expandidos is None:
+                def funcao(*argumentos):
+                    ao_expandir(argumentos[0])
+                    return expandida(*argumentos)
+            else:
+                def funcao(*argumentos):
+                    for codigo in expandidos(*argumentos):
+                        ao_expandir(codigo)
+                    return expandida(*argumentos)
+
+        return funcao
+
+    def __enter__(self):
+        if self.medir_memoria:
+            self._parar_tracemalloc = not tracemalloc.is_tracing()
+            if self._parar_tracemalloc:
+                tracemalloc.start()
+            else:
+                tracemalloc.reset_peak()
+            self._memoria_inicial = tracemalloc.get_traced_memory()[0]
+        if self.perfil is not None:
+            self.perfil.enable()
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excecao):
+        self.tempo_total += time.perf_counter() - self._inicio
+        if self.perfil is not None:
+            self.perfil.disable()
+        if self.medir_memoria:
+            self.pico_memoria = tracemalloc.get_traced_memory()[1] - self._memoria_inicial
+            if self._parar_tracemalloc:
+                tracemalloc.stop()
+
+    def estatisticas_perfil(self, ordem:str='cumulative')->pstats.Stats:
+        """
+        Retorna as estatísticas do perfil coletado, ordenadas pela coluna recebida
+        :param ordem: str, chave de ordenação de pstats
+        :return: pstats.Stats
+        """
+        if self.perfil is None:
+            raise ValueError("monitor criado sem perfil")
+        return pstats.Stats(self.perfil).sort_stats(ordem)
+
+    def como_dicionario(self)->dict:
+        """
+        Retorna as estatísticas coletadas em um dicionário (serializável em JSON)
+        :return: dict
+        """
+        resultado = self.resultado
+        estatisticas = {
+            'custo': len(resultado.caminho) if resultado and resultado.caminho is not None else None,
+            'nodos_expandidos': resultado.nodos_expandidos if resultado else None,
+            'nodos_gerados': resultado.nodos_gerados if resultado else None,
+            'duplicados_descartados': resultado.duplicados_descartados if resultado else None,
+            'tamanho_maximo_fronteira': resultado.tamanho_maximo_fronteira if resultado else None,
+            'esgotado': resultado.esgotado if resultado else None,
+            'fator_subotimo': _fator_serializavel(resultado.fator_subotimo) if resultado else None,
+            'tempo_total': self.tempo_total,
+            'pico_memoria': self.pico_memoria,
+        }
+        if self.medir_tempos:
+            estatisticas['tempos'] = dict(self.tempos)
+        return estatisticas
+
+    def __str__(self):
+        fases = ", ".join(f"{fase}: {tempo:.4f}s" for fase, tempo in self.tempos.items()) if self.medir_tempos else "-"
+        return (f"MonitorDeBusca ({self.resultado}, total: {self.tempo_total:.4f}s, fases: {fases}, "
+                f"pico de memoria: {self.pico_memoria})")
+
+def _fator_serializavel(fator:float)->float:
+    """
+    Retorna o fator de subotimalidade em forma serializável em JSON (None quando não há garantia)
+    :param fator: float
+    :return: float
+    """
+    return None if math.isinf(fator) else fator
+
+def monitoravel(busca):
+    """
+    Decorador das buscas que aceitam o parâmetro `monitor`: com um MonitorDeBusca, a busca é
+    executada dentro dele (tempo total, memória e perfil) e o resultado é registrado no monitor
+    :param busca: callable, função estado(str) -> ResultadoBusca com parâmetro monitor
+    :return: callable
+    """
+    @functools.wraps(busca)
+    def busca_monitorada(*argumentos, monitor:MonitorDeBusca=None, **opcoes):
+        if monitor is None:
+            return busca(*argumentos, **opcoes)
+        with monitor:
+            resultado = busca(*argumentos, monitor=monitor, **opcoes)
+        monitor.resultado = resultado
+        return resultado
+    return busca_monitorada
+
+# A* genérico ===========
+def heuristica_sobre_codigo(distancia)->callable:
+    """
+    Recebe uma heurística sobre estados (string) e retorna a heurística equivalente sobre a
+    representação inteira dos estados, usada pelo motor de busca
+    :param distancia: callable, função estado(str) -> int
+    :return: callable, função (codigo, puzzle) -> int
+    """
+    return lambda codigo, puzzle=None: distancia((puzzle or OITO_PUZZLE).decodifica(codigo))
+
+# Heurísticas disponíveis por nome, todas funções (codigo, puzzle) -> int sobre a representação inteira
+HEURISTICAS = {
+    'hamming': lambda codigo, puzzle=None: distancia_por_tabela(codigo, (puzzle or OITO_PUZZLE).tabelas['hamming'], puzzle),
+    'manhattan': lambda codigo, puzzle=None: distancia_por_tabela(codigo, (puzzle or OITO_PUZZLE).tabelas['manhattan'], puzzle),
+    'conflito_linear': heuristica_sobre_codigo(distancia_conflito_linear),
+    'padroes': lambda codigo, puzzle=None: pega_banco_de_padroes(puzzle).distancia(codigo),
+}
+
+# Heurísticas que podem ser atualizadas incrementalmente (tabelas do 3x3; as de cada tamanho
+# ficam em DefinicaoPuzzle.tabelas)
+TABELAS_HEURISTICAS = OITO_PUZZLE.tabelas
+
+def pega_heuristica(heuristica)->callable:
+    """
+    Recebe o nome de uma heurística registrada em HEURISTICAS ou uma função estado(str) -> int
+    e retorna a heurística sobre a representação inteira dos estados
+    :param heuristica: str ou callable
+    :return: callable
+    """
+    if callable(heuristica):
+        return heuristica_sobre_codigo(heuristica)
+    if heuristica not in HEURISTICAS:
+        raise ValueError(f"heurística desconhecida: {heuristica}")
+    return HEURISTICAS[heuristica]
+
+def pesos_da_prioridade(peso:float)->Tuple[int, int, float]:
+    """
+    Recebe o peso w da heurística e retorna os inteiros (a, b) com a·g + b·h na mesma ordem que g + w·h,
+    para que a prioridade continue inteira (como exigem as entradas do armazém e a fronteira em baldes),
+    e o fator de subotimalidade correspondente (math.inf para a busca gulosa, em que a = 0)
+    :param peso: float, w > 0 ou math.inf
+    :return: Tuple[int, int, float]
+    """
+    if not peso > 0:
+        raise ValueError(f"peso inválido: {peso}")
+    if math.isinf(peso):
+        return 0, 1, math.inf
+    fracao = Fraction(peso).limit_denominator(1000)
+    return fracao.denominator, fracao.numerator, max(1.0, float(fracao))
+
+@monitoravel
+def astar(estado:str, heuristica='manhattan', incremental:bool=True, armazem:str='arrays', fronteira:str='heap',
+          tempo_limite:float=None, limite_nodos:int=None, peso:float=1, monitor:MonitorDeBusca=None)->ResultadoBusca:
+    """
+    Recebe um estado (string), executa a busca A* com a heurística recebida e retorna um
+    ResultadoBusca com a lista de ações que leva do estado recebido até o objetivo ("12345678_"
+    ou o estado final do tabuleiro NxN correspondente) e as estatísticas da busca. Caso não haja
+    solução, o caminho do resultado é None.
+    Estados repetidos na fronteira são tratados por remoção preguiçosa: só se insere um vizinho
+    se o custo g encontrado for menor que o melhor conhecido, e entradas da fronteira com custo
+    pior que o melhor conhecido são descartadas ao serem retiradas.
+    No modo incremental (apenas para heurísticas em DefinicaoPuzzle.tabelas), cada entrada da fronteira
+    carrega o h do seu nodo e o h dos vizinhos é derivado em O(1) a partir da peça movida.
+    Ao atingir tempo_limite ou limite_nodos, a busca retorna um resultado com esgotado verdadeiro.
+    Com peso w > 1 a fronteira é ordenada por f = g + w·h (A* ponderado): com heurística admissível o
+    custo encontrado é no máximo w vezes o ótimo, em geral expandindo bem menos nodos. Com peso math.inf
+    a ordem é só por h (busca gulosa), sem garantia de custo. O limite é informado em fator_subotimo.
+    :param estado: str
+    :param heuristica: str (nome em HEURISTICAS) ou callable estado(str) -> int
+    :param incremental: bool, usa a atualização incremental da heurística quando disponível
+    :param armazem: str, forma de armazenar os nodos gerados (nome em ARMAZENS)
+    :param fronteira: str, estrutura da fronteira (nome em FRONTEIRAS)
+    :param tempo_limite: float, segundos até a busca ser interrompida (None para sem limite)
+    :param limite_nodos: int, máximo de nodos expandidos antes da interrupção (None para sem limite)
+    :param peso: float, peso w da heurística em f = g + w·h (math.inf para a busca gulosa)
+    :param monitor: MonitorDeBusca, coleta estatísticas e tempos por fase (None para não medir)
+    :return: ResultadoBusca
+    """
+    limite_busca = LimiteDeBusca(tempo_limite, limite_nodos)
+    peso_g, peso_h, fator_subotimo = pesos_da_prioridade(peso)
+    puzzle = puzzle_do_estado(estado)
+    heuristica_do_codigo = pega_heuristica(heuristica)
+    h = lambda codigo: heuristica_do_codigo(codigo, puzzle)
+    nodos = ARMAZENS[armazem](puzzle)
+    abertos = FRONTEIRAS[fronteira]()
+    if not e_soluvel(estado):                                           # evita explorar todo o espaço alcançável
+        return ResultadoBusca(None, 0, 0, 0, 0)
+
+    gera, incrementais = sucessores_codificados, sucessores_incrementais
+    empilha, desempilha = abertos.insere, abertos.retira
+    if monitor is not None:                                             # fases envolvidas apenas quando medidas
+        h = monitor.envolve('heuristica', h)
+        gera, incrementais = monitor.envolve('sucessores', gera), monitor.envolve('sucessores', incrementais)
+        empilha, desempilha = monitor.envolve('fronteira', empilha), monitor.envolve('fronteira', desempilha)
+
+    tabela = puzzle.tabelas.get(heuristica) if incremental and isinstance(heuristica, str) else None
+    if tabela is not None:
+        vizinhos = lambda codigo, distancia: incrementais(codigo, distancia, tabela, puzzle)
+    else:
+        vizinhos = lambda codigo, distancia: [(acao, c, h(c)) for acao, c in gera(codigo, puzzle)]
+
+    codigo_final = puzzle.codigo_final
+    codigo_raiz = puzzle.codifica(estado)
+
+    melhor_custo = {codigo_raiz: 0}                                     # menor g conhecido para cada estado
+    f_raiz = peso_h * h(codigo_raiz)
+    empilha(f_raiz, 0, nodos.entrada(f_raiz, nodos.adiciona(codigo_raiz, None, None, 0)))
+    nodos_expandidos = 0
+    nodos_gerados = 1
+    duplicados_descartados = 0
+    tamanho_maximo_fronteira = 1
+    verificacao = limite_busca.proxima
+
+    while abertos:
+        custo_total, nodo = nodos.abre_entrada(desempilha())
+        codigo = nodos.estado(nodo)
+        custo = nodos.custo(nodo)
+
+        if custo > melhor_custo[codigo]:                                # já foi encontrado caminho melhor para o estado
+            duplicados_descartados += 1
+            continue
+
+        if codigo == codigo_final:
+            return ResultadoBusca(nodos.trilha(nodo), nodos_expandidos, nodos_gerados, duplicados_descartados,
+                                  tamanho_maximo_fronteira, fator_subotimo=fator_subotimo)
+
+        if nodos_expandidos >= verificacao:                             # limite de tempo ou de nodos
+            if limite_busca.esgotado(nodos_expandidos):
+                return ResultadoBusca(None, nodos_expandidos, nodos_gerados, duplicados_descartados,
+                                      tamanho_maximo_fronteira, esgotado=True, fator_subotimo=fator_subotimo)
+            verificacao = limite_busca.proxima
+
+        nodos_expandidos += 1
+        custo_vizinho = custo + 1
+
+        for acao, codigo_vizinho, h_vizinho in vizinhos(codigo, (custo_total - peso_g * custo) // peso_h):
+            if custo_vizinho < melhor_custo.get(codigo_vizinho, custo_vizinho + 1):
+                melhor_custo[codigo_vizinho] = custo_vizinho
+                custo_total_vizinho = peso_g * custo_vizinho + peso_h * h_vizinho
+                empilha(custo_total_vizinho, custo_vizinho,
+                        nodos.entrada(custo_total_vizinho, nodos.adiciona(codigo_vizinho, nodo, acao, custo_vizinho)))
+                nodos_gerados += 1
+
+        if len(abertos) > tamanho_maximo_fronteira:
+            tamanho_maximo_fronteira = len(abertos)
+
+    return ResultadoBusca(None, nodos_expandidos, nodos_gerados, duplicados_descartados, tamanho_maximo_fronteira,
+                          fator_subotimo=fator_subotimo)
+
+@em_cache
+def astar_new_heuristic(estado:str)->list[str]:
+    """
+    Recebe um estado (string), executa a busca A* com h(n) = heurística de padrões disjuntos e
+    retorna uma lista de ações que leva do
+    estado recebido até o objetivo ("12345678_").
+    Caso não haja solução a partir do estado recebido, retorna None
+    :param estado: str
+    :return:
+    """
+    return astar(estado, 'padroes').caminho
+
+# Buscas subótimas ===========
+# Trocam a garantia de custo ótimo por menos nodos expandidos, usando as mesmas heurísticas de
+# funcao_de_custo_hamming e funcao_de_custo_manhattan (pelas tabelas de DefinicaoPuzzle.tabelas).
+# Cada resultado informa em fator_subotimo quanto o custo encontrado pode exceder o ótimo.
+@monitoravel
+def ara_estrela(estado:str, heuristica='manhattan', peso_inicial:float=3.0, decremento:float=0.5,
+                tempo_limite:float=None, limite_nodos:int=None, ao_melhorar=None,
+                monitor:MonitorDeBusca=None)->ResultadoBusca:
+    """
+    Recebe um estado (string) e executa o ARA* (Anytime Repairing A*): uma sequência de buscas A*
+    ponderadas com pesos decrescentes, de peso_inicial até 1, em que cada busca reaproveita os custos
+    da anterior. A primeira solução sai rápido e é melhorada a cada iteração, até a solução ótima ou
+    até tempo_limite / limite_nodos. Ao atingir o limite, retorna a melhor solução encontrada até então
+    (None se ainda não houver) com esgotado verdadeiro.
+    Estados cujo custo melhora depois de expandidos não são reabertos na mesma iteração: vão para a
+    lista de inconsistentes e voltam à fronteira na próxima. O fator_subotimo do resultado é
+    min(peso, custo / menor g + h da fronteira e dos inconsistentes), que só diminui com as iterações.
+    :param estado: str
+    :param heuristica: str, nome de uma heurística em DefinicaoPuzzle.tabelas
+    :param peso_inicial: float, peso da primeira iteração (>= 1)
+    :param decremento: float, quanto o peso diminui a cada iteração
+    :param tempo_limite: float, segundos até a busca ser interrompida (None para sem limite)
+    :param limite_nodos: int, máximo de nodos expandidos antes da interrupção (None para sem limite)
+    :param ao_melhorar: callable, recebe o ResultadoBusca ao fim de cada iteração (None para não avisar)
+    :param monitor: MonitorDeBusca, coleta estatísticas e tempos por fase (None para não medir)
+    :return: ResultadoBusca
+    """
+    limite_busca = LimiteDeBusca(tempo_limite, limite_nodos)
+    puzzle = puzzle_do_estado(estado)
+    if heuristica not in puzzle.tabelas:
+        raise ValueError(f"heurística sem tabela incremental: {heuristica}")
+    if not peso_inicial >= 1 or not decremento > 0:
+        raise ValueError(f"pesos inválidos: inicial {peso_inicial}, decremento {decremento}")
+    if not e_soluvel(estado):
+        return ResultadoBusca(None, 0, 0, 0, 0)
+
+    tabela = puzzle.tabelas[heuristica]
+    incrementais, empilha, desempilha = sucessores_incrementais, heapq.heappush, heapq.heappop
+    if monitor is not None:
+        incrementais = monitor.envolve('sucessores', incrementais)
+        empilha, desempilha = monitor.envolve('fronteira', empilha), monitor.envolve('fronteira', desempilha)
+
+    codigo_final = puzzle.codigo_final
+    codigo_raiz = puzzle.codifica(estado)
+    if codigo_raiz == codigo_final:
+        return ResultadoBusca([], 0, 1, 0, 1)
+
+    peso = peso_inicial
+    custos = {codigo_raiz: 0}                                           # menor g conhecido para cada estado
+    distancias = {codigo_raiz: distancia_por_tabela(codigo_raiz, tabela, puzzle)}
+    pais = {codigo_raiz: None}
+    abertos = {codigo_raiz: peso * distancias[codigo_raiz]}             # estado -> prioridade atual na fronteira
+    fronteira = [(abertos[codigo_raiz], 0, codigo_raiz)]                # (prioridade, -g, estado)
+    fechados, inconsistentes = set(), set()
+    caminho, fator_subotimo = None, math.inf
+    nodos_expandidos = 0
+    nodos_gerados = 1
+    duplicados_descartados = 0
+    tamanho_maximo_fronteira = 1
+    verificacao = limite_busca.proxima
+
+    while True:
+        while fronteira:                                                # A* ponderado até o objetivo ser o melhor
+            prioridade, _, codigo = fronteira[0]
+            if abertos.get(codigo) != prioridade:                       # entrada de prioridade antiga
+                desempilha(fronteira)
+                duplicados_descartados += 1
+                continue
+            if custos.get(codigo_final, math.inf) <= prioridade:
+                break
+
+            if nodos_expandidos >= verificacao:                         # limite de tempo ou de nodos
+                if limite_busca.esgotado(nodos_expandidos):
+                    return ResultadoBusca(caminho, nodos_expandidos, nodos_gerados, duplicados_descartados,
+                                          tamanho_maximo_fronteira, esgotado=True, fator_subotimo=fator_subotimo)
+                verificacao = limite_busca.proxima
+
+            desempilha(fronteira)
+            del abertos[codigo]
+            fechados.add(codigo)
+            nodos_expandidos += 1
+            custo_vizinho = custos[codigo] + 1
+
+            for acao, codigo_vizinho, h_vizinho in incrementais(codigo, distancias[codigo], tabela, puzzle):
+                if custo_vizinho < custos.get(codigo_vizinho, math.inf):
+                    custos[codigo_vizinho] = custo_vizinho
+                    distancias[codigo_vizinho] = h_vizinho
+                    pais[codigo_vizinho] = (codigo, acao)
+                    if codigo_vizinho in fechados:
+                        inconsistentes.add(codigo_vizinho)
+                    else:
+                        abertos[codigo_vizinho] = custo_vizinho + peso * h_vizinho
+                        empilha(fronteira, (abertos[codigo_vizinho], -custo_vizinho, codigo_vizinho))
+                        nodos_gerados += 1
+
+            if len(abertos) > tamanho_maximo_fronteira:
+                tamanho_maximo_fronteira = len(abertos)
+
+        if codigo_final not in custos:                                  # fronteira vazia sem o objetivo
+            return ResultadoBusca(None, nodos_expandidos, nodos_gerados, duplicados_descartados, tamanho_maximo_fronteira)
+        if caminho is None or custos[codigo_final] < len(caminho):
+            caminho = junta_caminhos(codigo_final, pais, {codigo_final: None})
+
+        menor_custo_total = min((custos[codigo] + distancias[codigo] for codigo in (*abertos, *inconsistentes)),
+                                default=math.inf)
+        fator_subotimo = max(1.0, min(peso, fator_subotimo, len(caminho) / menor_custo_total))
+        resultado = ResultadoBusca(caminho, nodos_expandidos, nodos_gerados, duplicados_descartados,
+                                   tamanho_maximo_fronteira, fator_subotimo=fator_subotimo)
+        if ao_melhorar is not None:
+            ao_melhorar(resultado)
+        if fator_subotimo <= 1:
+            return resultado
+
+        peso = max(1.0, peso - decremento)                              # próxima iteração, com a fronteira reordenada
+        abertos = {codigo: custos[codigo] + peso * distancias[codigo] for codigo in (*abertos, *inconsistentes)}
+        fronteira = [(prioridade, -custos[codigo], codigo) for codigo, prioridade in abertos.items()]
+        heapq.heapify(fronteira)
+        fechados, inconsistentes = set(), set()
+
+def astar_ponderado_manhattan(estado:str, peso:float=2.0)->list[str]:
+    """
+    Recebe um estado (string), executa o A* ponderado com f(n) = g(n) + peso * soma das distâncias de
+    Manhattan e retorna uma lista de ações (de custo no máximo peso vezes o ótimo) que leva do
+    estado recebido até o objetivo ("12345678_").
+    Caso não haja solução a partir do estado recebido, retorna None
+    :param estado: str
+    :param peso: float, peso da heurística
+    :return:
+    """
+    return astar(estado, 'manhattan', peso=peso).caminho
+
+def busca_gulosa_manhattan(estado:str)->list[str]:
+    """
+    Recebe um estado (string), executa a busca gulosa pela melhor escolha com f(n) = soma das
+    distâncias de Manhattan e retorna uma lista de ações (sem garantia de custo) que leva do
+    estado recebido até o objetivo ("12345678_").
+    Caso não haja solução a partir do estado recebido, retorna None
+    :param estado: str
+    :return:
+    """
+    return astar(estado, 'manhattan', peso=math.inf).caminho
+
+def ara_estrela_manhattan(estado:str, tempo_limite:float=0.1)->list[str]:
+    """
+    Recebe um estado (string), executa o ARA* com h(n) = soma das distâncias de Manhattan por até
+    tempo_limite segundos e retorna a melhor lista de ações encontrada que leva do
+    estado recebido até o objetivo ("12345678_").
+    Caso não haja solução (ou nenhuma tenha sido encontrada no prazo), retorna None
+    :param estado: str
+    :param tempo_limite: float, segundos para melhorar a solução
+    :return:
+    """
+    return ara_estrela(estado, 'manhattan', tempo_limite=tempo_limite).caminho
+
+# IDA* ===========
+class _BuscaEsgotada(Exception):
+    """
+    Interrompe a recursão do IDA* quando o LimiteDeBusca é atingido
+    """
+
+@monitoravel
+def idastar(estado:str, heuristica='manhattan', tempo_limite:float=None, limite_nodos:int=None,
+            monitor:MonitorDeBusca=None)->ResultadoBusca:
+    """
+    Recebe um estado (string), executa a busca IDA* (aprofundamento iterativo em f = g + h) e retorna
+    um ResultadoBusca com a lista de ações até o objetivo. Caso não haja solução, o caminho é None.
+    A busca guarda apenas o caminho atual: o tabuleiro é uma lista alterada no lugar a cada movimento
+    e restaurada ao voltar, e a heurística é atualizada pela peça movida. Assim a memória usada é
+    proporcional à profundidade da solução, e não ao número de nodos gerados.
+    Em tamanho_maximo_fronteira é informada a maior profundidade atingida.
+    Ao atingir tempo_limite ou limite_nodos, a busca retorna um resultado com esgotado verdadeiro.
+    :param estado: str
+    :param heuristica: str, nome de uma heurística em DefinicaoPuzzle.tabelas
+    :param tempo_limite: float, segundos até a busca ser interrompida (None para sem limite)
+    :param limite_nodos: int, máximo de nodos expandidos antes da interrupção (None para sem limite)
+    :param monitor: MonitorDeBusca, coleta os contadores, o tempo total, a memória e o perfil
+    :return: ResultadoBusca
+    """
+    limite_busca = LimiteDeBusca(tempo_limite, limite_nodos)
+    puzzle = puzzle_do_estado(estado)
+    if heuristica not in puzzle.tabelas:
+        raise ValueError(f"heurística sem tabela incremental: {heuristica}")
+    if not e_soluvel(estado):
+        return ResultadoBusca(None, 0, 0, 0, 0)
+
+    tabela = puzzle.tabelas[heuristica]
+    tabela_movimentos = puzzle.tabela_movimentos
+    tabuleiro = [puzzle.valor_simbolo[simbolo] for simbolo in separa_pecas(estado)]
+    caminho = []
+    estatisticas = {'expandidos': 0, 'gerados': 1, 'profundidade': 0, 'verificacao': limite_busca.proxima}
+
+    def busca(posicao_vazia:int, posicao_anterior:int, custo:int, distancia:int, limite:int):
+        """
+        Busca em profundidade limitada por f; retorna True se achou o objetivo, senão o menor f que
+        ultrapassou o limite
+        """
+        custo_total = custo + distancia
+        if custo_total > limite:
+            return custo_total
+        if distancia == 0:                                              # h nulo só no objetivo
+            return True
+
+        if estatisticas['expandidos'] >= estatisticas['verificacao']:  # limite de tempo ou de nodos
+            if limite_busca.esgotado(estatisticas['expandidos']):
+                raise _BuscaEsgotada()
+            estatisticas['verificacao'] = limite_busca.proxima
+
+        estatisticas['expandidos'] += 1
+        if custo + 1 > estatisticas['profundidade']:
+            estatisticas['profundidade'] = custo + 1
+        proximo_limite = float('inf')
+
+        for acao, nova_posicao, _, _, _ in tabela_movimentos[posicao_vazia]:
+            if nova_posicao == posicao_anterior:                        # não desfaz o último movimento
+                continue
+            peca = tabuleiro[nova_posicao]
+            contribuicao = tabela[peca]
+            tabuleiro[posicao_vazia], tabuleiro[nova_posicao] = peca, 0 # move a peça no lugar
+            caminho.append(acao)
+            estatisticas['gerados'] += 1
+
+            resultado = busca(nova_posicao, posicao_vazia, custo + 1,
+                              distancia - contribuicao[nova_posicao] + contribuicao[posicao_vazia], limite)
+            if resultado is True:
+                return True
+
+            caminho.pop()
+            tabuleiro[nova_posicao], tabuleiro[posicao_vazia] = peca, 0 # desfaz o movimento
+            if resultado < proximo_limite:
+                proximo_limite = resultado
+
+        return proximo_limite
+
+    posicao_vazia = tabuleiro.index(0)
+    distancia = sum(tabela[valor][posicao] for posicao, valor in enumerate(tabuleiro))
+    limite = distancia
+
+    while True:                                                         # aumenta o limite até achar o objetivo
+        try:
+            resultado = busca(posicao_vazia, None, 0, distancia, limite)
+        except _BuscaEsgotada:
+            return ResultadoBusca(None, estatisticas['expandidos'], estatisticas['gerados'], 0,
+                                  estatisticas['profundidade'], esgotado=True)
+        if resultado is True:
+            return ResultadoBusca(caminho, estatisticas['expandidos'], estatisticas['gerados'], 0,
+                                  estatisticas['profundidade'])
+        limite = resultado
+
+@em_cache
+def idastar_manhattan(estado:str)->list[str]:
+    """
+    Recebe um estado (string), executa a busca IDA* com h(n) = soma das distâncias de Manhattan e
+    retorna uma lista de ações que leva do
+    estado recebido até o objetivo ("12345678_").
+    Caso não haja solução a partir do estado recebido, retorna None
+    :param estado: str
+    :return:
+    """
+    return idastar(estado, 'manhattan').caminho
+
+# Buscas bidirecionais ===========
+# A busca para frente parte do estado recebido e a busca para trás parte do estado final. Cada lado
+# guarda, para cada estado alcançado, o estado vizinho pelo qual chegou e a ação que liga os dois:
+# para frente, a ação do pai até o estado; para trás, a ação do estado até o vizinho mais próximo
+# do objetivo (a oposta à ação usada na expansão para trás).
+ACAO_OPOSTA = {'acima': 'abaixo', 'abaixo': 'acima', 'esquerda': 'direita', 'direita': 'esquerda'}
+
+def junta_caminhos(encontro:int, pais_frente:dict, pais_tras:dict)->list[str]:
+    """
+    Recebe o código do estado de encontro e os mapas de pais das buscas para frente e para trás e
+    retorna a lista de ações da raiz até o objetivo passando pelo encontro
+    :param encontro: int
+    :param pais_frente: dict, código -> (código do pai, ação do pai até o estado) (None na raiz)
+    :param pais_tras: dict, código -> (código do próximo, ação do estado até o próximo) (None no objetivo)
+    :return: list[str]
+    """
+    caminho = []
+    codigo = encontro
+    while pais_frente[codigo] is not None:                              # do encontro até a raiz
+        codigo, acao = pais_frente[codigo]
+        caminho.append(acao)
+    caminho.reverse()
+
+    codigo = encontro
+    while pais_tras[codigo] is not None:                                # do encontro até o objetivo
+        codigo, acao = pais_tras[codigo]
+        caminho.append(acao)
+
+    return caminho
+
+@monitoravel
+def busca_bidirecional(estado:str, tempo_limite:float=None, limite_nodos:int=None,
+                       monitor:MonitorDeBusca=None)->ResultadoBusca:
+    """
+    Recebe um estado (string), executa a busca em largura bidirecional e retorna um ResultadoBusca
+    com a lista de ações até o objetivo. Caso não haja solução, o caminho é None.
+    A cada passo expande-se uma camada inteira do lado com a menor fronteira; quando algum estado
+    gerado já foi alcançado pelo outro lado, o menor caminho entre os encontros dessa camada é ótimo.
+    São explorados da ordem de 2·b^(d/2) estados em vez de b^d.
+    Ao atingir tempo_limite ou limite_nodos, a busca retorna um resultado com esgotado verdadeiro.
+    :param estado: str
+    :param tempo_limite: float, segundos até a busca ser interrompida (None para sem limite)
+    :param limite_nodos: int, máximo de nodos expandidos antes da interrupção (None para sem limite)
+    :param monitor: MonitorDeBusca, coleta estatísticas e o tempo de geração de sucessores (None para não medir)
+    :return: ResultadoBusca
+    """
+    limite_busca = LimiteDeBusca(tempo_limite, limite_nodos)
+    puzzle = puzzle_do_estado(estado)
+    if not e_soluvel(estado):
+        return ResultadoBusca(None, 0, 0, 0, 0)
+
+    gera = sucessores_codificados if monitor is None else monitor.envolve('sucessores', sucessores_codificados)
+
+    codigo_raiz = puzzle.codifica(estado)
+    codigo_final = puzzle.codigo_final
+    if codigo_raiz == codigo_final:
+        return ResultadoBusca([], 0, 1, 0, 1)
+
+    # por lado: mapa de pais, profundidade de cada estado e camada atual
+    pais = ({codigo_raiz: None}, {codigo_final: None})
+    profundidades = ({codigo_raiz: 0}, {codigo_final: 0})
+    camadas = ([codigo_raiz], [codigo_final])
+    nodos_expandidos = 0
+    nodos_gerados = 2
+    tamanho_maximo_fronteira = 2
+    verificacao = limite_busca.proxima
+
+    while camadas[0] and camadas[1]:
+        lado = 0 if len(camadas[0]) <= len(camadas[1]) else 1          # expande o lado com a menor fronteira
+        pais_lado, profundidades_lado = pais[lado], profundidades[lado]
+        profundidades_outro = profundidades[1 - lado]
+        profundidade = profundidades_lado[camadas[lado][0]] + 1
+        proxima_camada = []
+        melhor = None                                                   # (custo total, estado de encontro)
+
+        for codigo in camadas[lado]:
+            if nodos_expandidos >= verificacao:                         # limite de tempo ou de nodos
+                if limite_busca.esgotado(nodos_expandidos):
+                    return ResultadoBusca(None, nodos_expandidos, nodos_gerados, 0, tamanho_maximo_fronteira,
+                                          esgotado=True)
+                verificacao = limite_busca.proxima
+            nodos_expandidos += 1
+            for acao, vizinho in gera(codigo, puzzle):
+                if vizinho in pais_lado:
+                    continue
+                pais_lado[vizinho] = (codigo, acao) if lado == 0 else (codigo, ACAO_OPOSTA[acao])
+                profundidades_lado[vizinho] = profundidade
+                proxima_camada.append(vizinho)
+                nodos_gerados += 1
+                if vizinho in profundidades_outro:                      # interseção com o outro lado
+                    custo = profundidade + profundidades_outro[vizinho]
+                    if melhor is None or custo < melhor[0]:
+                        melhor = (custo, vizinho)
+
+        if melhor is not None:
+            return ResultadoBusca(junta_caminhos(melhor[1], pais[0], pais[1]), nodos_expandidos,
+                                  nodos_gerados, 0, tamanho_maximo_fronteira)
+
+        camadas = (proxima_camada, camadas[1]) if lado == 0 else (camadas[0], proxima_camada)
+        tamanho_maximo_fronteira = max(tamanho_maximo_fronteira, len(camadas[0]) + len(camadas[1]))
+
+    return ResultadoBusca(None, nodos_expandidos, nodos_gerados, 0, tamanho_maximo_fronteira)
+
+@monitoravel
+def astar_bidirecional(estado:str, heuristica='manhattan', tempo_limite:float=None, limite_nodos:int=None,
+                       monitor:MonitorDeBusca=None)->ResultadoBusca:
+    """
+    Recebe um estado (string), executa o A* bidirecional "front-to-end" e retorna um ResultadoBusca
+    com a lista de ações até o objetivo. Caso não haja solução, o caminho é None.
+    A busca para frente estima a distância até o objetivo e a busca para trás estima a distância
+    até o estado recebido (com a mesma heurística, calculada em relação a cada alvo). Expande-se
+    sempre o lado com a menor fronteira, guardando o menor custo μ de um caminho pelos estados
+    alcançados pelos dois lados; a busca termina quando μ <= max(menor f de cada lado), o que
+    garante que μ é ótimo para heurísticas consistentes.
+    Ao atingir tempo_limite ou limite_nodos, a busca retorna um resultado com esgotado verdadeiro.
+    :param estado: str
+    :param heuristica: str, nome de uma heurística em DefinicaoPuzzle.tabelas
+    :param tempo_limite: float, segundos até a busca ser interrompida (None para sem limite)
+    :param limite_nodos: int, máximo de nodos expandidos antes da interrupção (None para sem limite)
+    :param monitor: MonitorDeBusca, coleta estatísticas e tempos por fase (None para não medir)
+    :return: ResultadoBusca
+    """
+    limite_busca = LimiteDeBusca(tempo_limite, limite_nodos)
+    puzzle = puzzle_do_estado(estado)
+    if heuristica not in puzzle.tabelas:
+        raise ValueError(f"heurística sem tabela incremental: {heuristica}")
+    if not e_soluvel(estado):
+        return ResultadoBusca(None, 0, 0, 0, 0)
+
+    incrementais = sucessores_incrementais
+    empilha, desempilha = heapq.heappush, heapq.heappop
+    if monitor is not None:                                             # fases envolvidas apenas quando medidas
+        incrementais = monitor.envolve('sucessores', incrementais)
+        empilha, desempilha = monitor.envolve('fronteira', empilha), monitor.envolve('fronteira', desempilha)
+
+    geradores = {'manhattan': gera_tabela_manhattan, 'hamming': gera_tabela_hamming}
+    tabelas = (puzzle.tabelas[heuristica], geradores[heuristica](puzzle, estado))
+    codigo_raiz = puzzle.codifica(estado)
+    codigo_final = puzzle.codigo_final
+    inicios = (codigo_raiz, codigo_final)
+
+    pais = ({codigo_raiz: None}, {codigo_final: None})
+    custos = ({codigo_raiz: 0}, {codigo_final: 0})
+    fronteiras = tuple([(distancia_por_tabela(inicio, tabela, puzzle), 0, inicio, 0)]
+                       for inicio, tabela in zip(inicios, tabelas))
+    contador = 0                                                        # desempate entre entradas com o mesmo f
+    melhor_custo = 0 if codigo_raiz == codigo_final else float('inf')   # μ
+    encontro = codigo_raiz if codigo_raiz == codigo_final else None
+    nodos_expandidos = 0
+    nodos_gerados = 2
+    duplicados_descartados = 0
+    tamanho_maximo_fronteira = 2
+    verificacao = limite_busca.proxima
+
+    while fronteiras[0] and fronteiras[1]:
+        if melhor_custo <= max(fronteiras[0][0][0], fronteiras[1][0][0]):
+            break
+
+        lado = 0 if len(fronteiras[0]) <= len(fronteiras[1]) else 1
+        fronteira, custos_lado, pais_lado = fronteiras[lado], custos[lado], pais[lado]
+        custos_outro = custos[1 - lado]
+        custo_total, _, codigo, custo = desempilha(fronteira)
+
+        if custo > custos_lado[codigo]:                                 # já foi encontrado caminho melhor
+            duplicados_descartados += 1
+            continue
+
+        if nodos_expandidos >= verificacao:                             # limite de tempo ou de nodos
+            if limite_busca.esgotado(nodos_expandidos):
+                return ResultadoBusca(None, nodos_expandidos, nodos_gerados, duplicados_descartados,
+                                      tamanho_maximo_fronteira, esgotado=True)
+            verificacao = limite_busca.proxima
+
+        nodos_expandidos += 1
+        custo_vizinho = custo + 1
+        for acao, vizinho, h_vizinho in incrementais(codigo, custo_total - custo, tabelas[lado], puzzle):
+            if custo_vizinho < custos_lado.get(vizinho, custo_vizinho + 1):
+                custos_lado[vizinho] = custo_vizinho
+                pais_lado[vizinho] = (codigo, acao) if lado == 0 else (codigo, ACAO_OPOSTA[acao])
+                contador += 1
+                empilha(fronteira, (custo_vizinho + h_vizinho, contador, vizinho, custo_vizinho))
+                nodos_gerados += 1
+                if vizinho in custos_outro and custo_vizinho + custos_outro[vizinho] < melhor_custo:
+                    melhor_custo = custo_vizinho + custos_outro[vizinho]
+                    encontro = vizinho
+
+        tamanho_maximo_fronteira = max(tamanho_maximo_fronteira, len(fronteiras[0]) + len(fronteiras[1]))
+
+    caminho = junta_caminhos(encontro, pais[0], pais[1]) if encontro is not None else None
+    return ResultadoBusca(caminho, nodos_expandidos, nodos_gerados, duplicados_descartados, tamanho_maximo_fronteira)
+
+@em_cache
+def astar_bidirecional_manhattan(estado:str)->list[str]:
+    """
+    Recebe um estado (string), executa o A* bidirecional com h(n) = soma das distâncias de Manhattan e
+    retorna uma lista de ações que leva do
+    estado recebido até o objetivo ("12345678_").
+    Caso não haja solução a partir do estado recebido, retorna None
+    :param estado: str
+    :return:
+    """
+    return astar_bidirecional(estado, 'manhattan').caminho
+
+@em_cache
+def bfs(estado:str)->list[str]:
+    """
+    Recebe um estado (string), executa a busca em LARGURA (bidirecional) e
+    retorna uma lista de ações que leva do
+    estado recebido até o objetivo ("12345678_").
+    Caso não haja solução a partir do estado recebido, retorna None
+    :param estado: str
+    :return:
+    """
+    return busca_bidirecional(estado).caminho
+
+# Buscas em lote ===========
+@monitoravel
+def busca_em_camadas_lote(estado:str, largura:int=None, heuristica:str='manhattan', tempo_limite:float=None,
+                          limite_nodos:int=None, monitor:MonitorDeBusca=None)->ResultadoBusca:
+    """
+    Busca camada por camada com os estados de cada camada em um lote NumPy: todos os sucessores, as
+    chaves e a heurística da camada são calculados de uma vez. Sem largura, é uma busca em largura (ótima);
+    com largura, é uma busca em feixe que mantém apenas os `largura` estados de menor heurística em cada
+    camada (rápida, mas sem garantia de custo ótimo, e pode não encontrar solução); os estados cortados
+    pelo feixe não entram em duplicados_descartados. Com monitor, as fases são medidas por camada e
+    ao_expandir recebe o código de cada estado da camada expandida.
+    :param estado: str
+    :param largura: int, estados mantidos por camada (None para manter todos)
+    :param heuristica: str, nome de uma heurística em DefinicaoPuzzle.tabelas, usada com largura
+    :param tempo_limite: float, segundos até a busca ser interrompida (None para sem limite)
+    :param limite_nodos: int, máximo de nodos expandidos antes da interrupção (None para sem limite)
+    :param monitor: MonitorDeBusca
+    :return: ResultadoBusca
+    """
+    limite_busca = LimiteDeBusca(tempo_limite, limite_nodos)
+    puzzle = puzzle_do_estado(estado)
+    if heuristica not in puzzle.tabelas:
+        raise ValueError(f"heurística sem tabela: {heuristica}")
+    if not e_soluvel(estado):
+        return ResultadoBusca(None, 0, 0, 0, 0)
+
+    expande, distancia = proxima_camada_lote, distancia_por_tabela_lote
+    if monitor is not None:
+        expande = monitor.envolve('sucessores', expande, lambda camada, *_: codigos_lote(camada, puzzle))
+        distancia = monitor.envolve('heuristica', distancia)
+
+    camada = tabuleiros_de_estados([estado], puzzle)
+    chaves = chaves_lote(camada, puzzle)
+    chave_final = chaves_lote(tabuleiros_de_estados([puzzle.estado_final], puzzle), puzzle)[0]
+    if chaves[0] == chave_final:
+        return ResultadoBusca([], 0, 1, 0, 1)
+
+    # com feixe, estados descartados podem reaparecer em qualquer camada, então todas as chaves são guardadas;
+    # na busca em largura bastam as duas últimas camadas
+    camadas_chaves = [chaves]
+    pais_por_camada, acoes_por_camada = [], []
+    nodos_expandidos = 0
+    nodos_gerados = 1
+    duplicados_descartados = 0
+    tamanho_maximo_fronteira = 1
+
+    while len(camada):
+        if limite_busca.esgotado(nodos_expandidos):
+            return ResultadoBusca(None, nodos_expandidos, nodos_gerados, duplicados_descartados,
+                                  tamanho_maximo_fronteira, esgotado=True)
+
+        vistas = np.concatenate(camadas_chaves if largura is not None else camadas_chaves[-2:])
+        nodos_expandidos += len(camada)
+        camada, chaves, pais, acoes, descartados = expande(camada, vistas, puzzle)
+        duplicados_descartados += descartados
+
+        if largura is not None and len(camada) > largura:          # mantém os de menor heurística
+            melhores = np.argsort(distancia(camada, puzzle.tabelas[heuristica]), kind='stable')[:largura]
+            camada, chaves, pais, acoes = camada[melhores], chaves[melhores], pais[melhores], acoes[melhores]
+
+        nodos_gerados += len(camada)
+        tamanho_maximo_fronteira = max(tamanho_maximo_fronteira, len(camada))
+        camadas_chaves.append(chaves)
+        if largura is None and len(camadas_chaves) > 2:
+            camadas_chaves.pop(0)
+        pais_por_camada.append(pais)
+        acoes_por_camada.append(acoes)
+
+        encontrados = np.flatnonzero(chaves == chave_final)
+        if len(encontrados):                                        # volta pelos pais de cada camada
+            caminho = []
+            indice = encontrados[0]
+            for pais, acoes in zip(reversed(pais_por_camada), reversed(acoes_por_camada)):
+                caminho.append(ACOES[acoes[indice]])
+                indice = pais[indice]
+            caminho.reverse()
+            return ResultadoBusca(caminho, nodos_expandidos, nodos_gerados, duplicados_descartados,
+                                  tamanho_maximo_fronteira, fator_subotimo=math.inf if largura is not None else 1.0)
+
+    return ResultadoBusca(None, nodos_expandidos, nodos_gerados, duplicados_descartados, tamanho_maximo_fronteira)
+
+@em_cache
+def bfs_lote(estado:str)->list[str]:
+    """
+    Recebe um estado (string), executa a busca em LARGURA em lote (NumPy) e
+    retorna uma lista de ações que leva do
+    estado recebido até o objetivo ("12345678_").
+    Caso não haja solução a partir do estado recebido, retorna None
+    :param estado: str
+    :return:
+    """
+    return busca_em_camadas_lote(estado).caminho
+
+def busca_em_feixe_manhattan(estado:str, largura:int=1000)->list[str]:
+    """
+    Recebe um estado (string), executa a busca em feixe em lote com h(n) = soma das distâncias de
+    Manhattan e retorna uma lista de ações (não necessariamente ótima) que leva do
+    estado recebido até o objetivo ("12345678_").
+    Caso o feixe não encontre solução, retorna None
+    :param estado: str
+    :param largura: int, estados mantidos por camada
+    :return:
+    """
+    return busca_em_camadas_lote(estado, largura, 'manhattan').caminho
+
+# Não preenchidos ===========
+def dfs(estado:str)->list[str]:
+    """
+    Recebe um estado (string), executa a busca em PROFUNDIDADE e
     retorna uma lista de ações que leva do
     estado recebido até o objetivo ("12345678_").
     Caso não haja solução a partir do estado recebido, retorna None
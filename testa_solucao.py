@@ -1,7 +1,35 @@
+import contextlib
+import functools
+import io
+import json
+import math
+import multiprocessing.queues
+import os
+import queue
+import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
 import timer
+import benchmark
+import eight_puzzle.lote as lote
+import eight_puzzle.paralelo as paralelo
+import eight_puzzle.servico as servico
 import eight_puzzle.solucao as solucao
 
+def busca_lenta(estado):
+    """
+    Algoritmo de teste que nunca termina a tempo
+    """
+    time.sleep(30)
+
+def busca_que_encerra(estado):
+    """
+    Algoritmo de teste que derruba o processo trabalhador
+    """
+    os._exit(1)
+
 class TestaSolucao(unittest.TestCase):
     
     def test_funcao_sucessor(self):
@@ -37,6 +65,196 @@ class TestaSolucao(unittest.TestCase):
             # verifica se a tupla com os atributos do nodo esta' presente no conjunto com os nodos esperados
             self.assertIn((nodo.estado, nodo.pai.estado, nodo.acao, nodo.custo), resposta_esperada)
 
+    def test_codificacao_estado(self):
+        """
+        Testa se a codificação inteira preserva o estado e gera os mesmos sucessores da versão em string
+        :return:
+        """
+        for estado in ["2_3541687", "185432_67", "12345678_", "_23541687"]:
+            codigo = solucao.codifica_estado(estado)
+            self.assertEqual(estado, solucao.decodifica_estado(codigo))
+            self.assertEqual(estado.index('_'), solucao.posicao_vazio_codificado(codigo))
+
+            sucessores = {(acao, solucao.decodifica_estado(c)) for acao, c in solucao.sucessores_codificados(codigo)}
+            self.assertEqual(solucao.sucessor(estado), sucessores)
+            for acao, estado_atingido in sucessores:
+                self.assertEqual(estado_atingido, solucao.altera_estado(estado, acao))
+
+    def test_heuristica_incremental(self):
+        """
+        Testa se a heurística derivada da peça movida é igual à heurística recalculada do zero
+        :return:
+        """
+        for nome, tabela in solucao.TABELAS_HEURISTICAS.items():
+            codigo = solucao.codifica_estado("2_3541687")
+            distancia = solucao.HEURISTICAS[nome](codigo)
+            for passo in range(50):  # caminha pelo espaço de estados comparando as duas formas de cálculo
+                sucessores = solucao.sucessores_incrementais(codigo, distancia, tabela)
+                for _, codigo_sucessor, distancia_sucessor in sucessores:
+                    self.assertEqual(solucao.HEURISTICAS[nome](codigo_sucessor), distancia_sucessor)
+                _, codigo, distancia = sucessores[passo % len(sucessores)]
+
+        self.assertEqual(11, solucao.distancia_manhattan("2_3541687"))
+        self.assertEqual(6, solucao.distancia_hamming("2_3541687"))
+        self.assertEqual(0, solucao.distancia_manhattan("12345678_"))
+
+    def test_banco_de_padroes(self):
+        """
+        Testa a geração das tabelas de padrões em disco e se a heurística domina a distância de Manhattan
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as diretorio:
+            banco = solucao.BancoDePadroes(diretorio=diretorio)
+            for padrao in solucao.PADROES_DISJUNTOS:
+                caminho = solucao.caminho_tabela_padrao(padrao, diretorio)
+                self.assertEqual(solucao.tamanho_tabela_padrao(len(padrao)), os.path.getsize(caminho))
+
+            self.assertEqual(0, banco.distancia(solucao.codifica_estado("12345678_")))
+            for estado in ["2_3541687", "185432_67", "1235_6478", "_23541687"]:
+                codigo = solucao.codifica_estado(estado)
+                self.assertGreaterEqual(banco.distancia(codigo), solucao.HEURISTICAS['manhattan'](codigo))
+
+            for tabela in banco.tabelas:
+                tabela.close()
+
+        # a heurística de padrões deve expandir muito menos nodos que Manhattan
+        self.assertLess(solucao.astar("2_3541687", 'padroes').nodos_expandidos * 5,
+                        solucao.astar("2_3541687", 'manhattan').nodos_expandidos)
+
+    def test_oraculo(self):
+        """
+        Testa se o oráculo de distâncias exatas retorna caminhos ótimos que levam ao objetivo
+        e detecta estados sem solução com uma consulta
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as diretorio:
+            oraculo = solucao.Oraculo(diretorio=diretorio)
+            self.assertEqual(solucao.tamanho_tabela_padrao(solucao.NUMERO_POSICOES),
+                             os.path.getsize(solucao.caminho_tabela_distancias(diretorio)))
+
+            for estado, custo in [("2_3541687", 23), ("1235_6478", 4), ("12345678_", 0)]:
+                caminho = oraculo.resolve(estado)
+                self.assertEqual(custo, len(caminho))
+                for acao in caminho:
+                    estado = solucao.altera_estado(estado, acao)
+                self.assertEqual(solucao.DadosSolucaoPuzzle.estado_final, estado)
+
+            self.assertIsNone(oraculo.resolve("185423_67"))
+            self.assertIsNone(oraculo.distancia(solucao.codifica_estado("185423_67")))
+            oraculo.tabela.close()
+
+            oraculo.tabela = bytearray(solucao.tamanho_tabela_padrao(solucao.NUMERO_POSICOES))
+            oraculo.tabela[solucao.rank_estado(solucao.codifica_estado("2_3541687"))] = 30
+            self.assertRaises(ValueError, oraculo.resolve, "2_3541687")
+
+    def test_e_soluvel(self):
+        """
+        Testa a verificação de solubilidade por paridade, inclusive em um tabuleiro 2x4
+        :return:
+        """
+        self.assertTrue(solucao.e_soluvel("2_3541687"))
+        self.assertTrue(solucao.e_soluvel("12345678_"))
+        self.assertFalse(solucao.e_soluvel("185423_67"))
+        self.assertFalse(solucao.e_soluvel("21345678_"))
+
+        # tabuleiro 2x4 (largura par): trocar duas peças inverte a solubilidade, mover o vazio não
+        self.assertTrue(solucao.e_soluvel("123_5674", colunas=4, estado_final="1234567_"))
+        self.assertTrue(solucao.e_soluvel("1234567_", colunas=4, estado_final="1234567_"))
+        self.assertFalse(solucao.e_soluvel("2134567_", colunas=4, estado_final="1234567_"))
+
+        resultado = solucao.astar("185423_67")
+        self.assertIsNone(resultado.caminho)
+        self.assertEqual(0, resultado.nodos_expandidos)
+
+    def test_resolve_lote(self):
+        """
+        Testa a resolução em lote: estados repetidos resolvidos uma vez, estados sem solução
+        e tempo esgotado ou trabalhador encerrado sem derrubar o pool
+        :return:
+        """
+        estados = ["2_3541687", "1235_6478", "185423_67", "2_3541687"]
+        with lote.PoolDeBusca(workers=2) as pool:
+            respostas = list(pool.resolve(estados, 'astar_manhattan'))
+            self.assertEqual(set(), pool.tabelas_carregadas)
+            self.assertEqual(3, len(respostas))
+            respostas = dict(respostas)
+            self.assertEqual(23, len(respostas["2_3541687"]))
+            self.assertEqual(['esquerda', 'abaixo', 'direita', 'direita'], respostas["1235_6478"])
+            self.assertIsNone(respostas["185423_67"])
+
+            self.assertEqual([("2_3541687", lote.TEMPO_ESGOTADO)],
+                             list(pool.resolve(["2_3541687"], busca_lenta, timeout=0.2)))
+            self.assertEqual(2, len(list(pool.resolve(["2_3541687", "1235_6478"], 'astar_new_heuristic'))))
+            self.assertEqual({'astar_new_heuristic'}, pool.tabelas_carregadas)
+
+            self.assertEqual([("2_3541687", lote.TRABALHADOR_ENCERRADO)],
+                             list(pool.resolve(["2_3541687"], busca_que_encerra)))
+            self.assertEqual(['esquerda', 'abaixo', 'direita', 'direita'],
+                             dict(pool.resolve(["1235_6478", "2_3541687"], 'astar_manhattan'))["1235_6478"])
+
+    def test_armazem_de_nodos(self):
+        """
+        Testa a reconstrução da trilha pelos índices dos pais e se as duas formas de armazenar
+        os nodos levam ao mesmo resultado
+        :return:
+        """
+        armazem = solucao.ArmazemDeNodos()
+        raiz = armazem.adiciona(solucao.codifica_estado("1235_6478"), None, None, 0)
+        filho = armazem.adiciona(solucao.codifica_estado("123_56478"), raiz, 'esquerda', 1)
+        neto = armazem.adiciona(solucao.codifica_estado("123456_78"), filho, 'abaixo', 2)
+        self.assertEqual(['esquerda', 'abaixo'], solucao.trilha_de_estados_a_partir_da_raiz(neto, armazem))
+        self.assertEqual([], armazem.trilha(raiz))
+        self.assertEqual(2, armazem.custo(neto))
+
+        for estado in ["2_3541687", "1235_6478"]:
+            com_objetos = solucao.astar(estado, armazem='objetos')
+            com_arrays = solucao.astar(estado, armazem='arrays')
+            self.assertEqual(com_objetos.caminho, com_arrays.caminho)
+            self.assertEqual(com_objetos.nodos_expandidos, com_arrays.nodos_expandidos)
+
+    def test_idastar(self):
+        """
+        Testa se o IDA* encontra caminhos ótimos que levam ao objetivo e guarda apenas o caminho atual
+        :return:
+        """
+        for estado in ["2_3541687", "8672543_1", "12345678_"]:
+            resultado = solucao.idastar(estado)
+            self.assertEqual(len(solucao.astar(estado).caminho), len(resultado.caminho))
+            self.assertEqual(len(resultado.caminho), resultado.tamanho_maximo_fronteira)
+            for acao in resultado.caminho:
+                estado = solucao.altera_estado(estado, acao)
+            self.assertEqual(solucao.DadosSolucaoPuzzle.estado_final, estado)
+
+        self.assertIsNone(solucao.idastar_manhattan("185423_67"))
+        self.assertRaises(ValueError, solucao.idastar, "2_3541687", 'padroes')
+
+    def test_tabuleiros_maiores(self):
+        """
+        Testa os mesmos algoritmos em tabuleiros 4x4 e 5x5, com peças separadas por espaços
+        :return:
+        """
+        quinze = solucao.pega_puzzle(4)
+        self.assertEqual("1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 _", quinze.estado_final)
+        self.assertIs(quinze, solucao.puzzle_do_estado(quinze.estado_final))
+        self.assertRaises(ValueError, solucao.puzzle_do_estado, "1 2 3 _ 5")
+
+        estado = "5 1 3 4 2 10 6 8 9 7 15 11 13 _ 14 12"
+        self.assertEqual(estado, solucao.decodifica_estado(solucao.codifica_estado(estado), quinze))
+        self.assertEqual({("acima", "5 1 3 4 2 10 6 8 9 _ 15 11 13 7 14 12"),
+                          ("esquerda", "5 1 3 4 2 10 6 8 9 7 15 11 _ 13 14 12"),
+                          ("direita", "5 1 3 4 2 10 6 8 9 7 15 11 13 14 _ 12")}, solucao.sucessor(estado))
+        self.assertFalse(solucao.e_soluvel("5 1 3 4 2 10 6 8 9 7 15 11 14 _ 13 12"))
+
+        for estado, custo in [(estado, 12),
+                              ("6 2 3 9 4 7 1 8 14 5 11 12 13 10 _ 16 17 18 19 15 21 22 23 24 20", 16)]:
+            puzzle = solucao.puzzle_do_estado(estado)
+            for resultado in [solucao.astar(estado), solucao.idastar(estado)]:
+                self.assertEqual(custo, len(resultado.caminho))
+                final = estado
+                for acao in resultado.caminho:
+                    final = solucao.altera_estado(final, acao)
+                self.assertEqual(puzzle.estado_final, final)
+
     def run_algorithm(self, alg, input):
         """
         Um helper que executa o algoritmo verificando timeout. Falha se der timeout
@@ -79,6 +297,348 @@ class TestaSolucao(unittest.TestCase):
         # nao ha solucao a partir do estado 185423_67
         self.assertIsNone(self.run_algorithm(solucao.astar_manhattan, "185423_67"))
     
+    def test_run_astar_new_heuristic(self):
+        """
+        Testa o A* com a nova heurística em um estado com solução e outro sem solução.
+        :return:
+        """
+        # no estado 2_3541687, a solucao otima tem 23 movimentos.
+        self.assertEqual(23, len(self.run_algorithm(solucao.astar_new_heuristic, "2_3541687")))
+
+        # nao ha solucao a partir do estado 185423_67
+        self.assertIsNone(self.run_algorithm(solucao.astar_new_heuristic, "185423_67"))
+
+    def test_astar_generico(self):
+        """
+        Testa o A* genérico com heurísticas registradas e com uma heurística passada como função
+        :return:
+        """
+        resultado_manhattan = solucao.astar("2_3541687", heuristica='manhattan')
+        resultado_nulo = solucao.astar("2_3541687", heuristica=lambda estado: 0)
+
+        self.assertEqual(23, len(resultado_manhattan.caminho))
+        self.assertEqual(23, len(resultado_nulo.caminho))
+        # a heurística informada deve reduzir o número de nodos expandidos
+        self.assertLess(resultado_manhattan.nodos_expandidos, resultado_nulo.nodos_expandidos)
+        self.assertLessEqual(resultado_manhattan.tamanho_maximo_fronteira, resultado_manhattan.nodos_gerados)
+        self.assertEqual([], solucao.astar("12345678_").caminho)
+        self.assertRaises(ValueError, solucao.astar, "2_3541687", 'inexistente')
+
+    def test_run_bfs(self):
+        """
+        Testa a busca em largura (bidirecional) em um estado com solução e outro sem solução.
+        :return:
+        """
+        # no estado 2_3541687, a solucao otima tem 23 movimentos.
+        self.assertEqual(23, len(self.run_algorithm(solucao.bfs, "2_3541687")))
+
+        # nao ha solucao a partir do estado 185423_67
+        self.assertIsNone(self.run_algorithm(solucao.bfs, "185423_67"))
+
+    def test_buscas_bidirecionais(self):
+        """
+        Testa se as buscas bidirecionais retornam caminhos ótimos que levam ao objetivo
+        :return:
+        """
+        for estado in ["8672543_1", "2_3541687", "12345678_"]:
+            custo_otimo = len(solucao.astar(estado).caminho)
+            for resultado in [solucao.busca_bidirecional(estado), solucao.astar_bidirecional(estado)]:
+                self.assertEqual(custo_otimo, len(resultado.caminho))
+                final = estado
+                for acao in resultado.caminho:
+                    final = solucao.altera_estado(final, acao)
+                self.assertEqual(solucao.DadosSolucaoPuzzle.estado_final, final)
+
+        # a busca bidirecional explora bem menos estados que a busca em largura comum
+        self.assertLess(solucao.busca_bidirecional("8672543_1").nodos_gerados, 181440 // 4)
+        self.assertIsNone(solucao.astar_bidirecional_manhattan("185423_67"))
+
+    def test_monitor_de_busca(self):
+        """
+        Testa se o monitor registra as estatísticas e os tempos por fase sem alterar o resultado da busca
+        :return:
+        """
+        expandidos = []
+        monitor = solucao.MonitorDeBusca(memoria=True, perfil=True, ao_expandir=expandidos.append)
+        resultado = solucao.astar("2_3541687", monitor=monitor)
+
+        self.assertIs(resultado, monitor.resultado)
+        self.assertEqual(solucao.astar("2_3541687").caminho, resultado.caminho)
+        self.assertEqual(resultado.nodos_expandidos, len(expandidos))
+        self.assertGreater(monitor.tempos['sucessores'], 0)
+        self.assertGreater(monitor.tempos['fronteira'], 0)
+        self.assertGreaterEqual(monitor.tempo_total, sum(monitor.tempos.values()))
+        self.assertGreater(monitor.pico_memoria, 0)
+        self.assertGreater(monitor.estatisticas_perfil().total_calls, 0)
+        self.assertEqual(23, monitor.como_dicionario()['custo'])
+
+        for busca in [solucao.idastar, solucao.busca_bidirecional, solucao.astar_bidirecional]:
+            monitor = solucao.MonitorDeBusca()
+            self.assertEqual(23, len(busca("2_3541687", monitor=monitor).caminho))
+            self.assertEqual(23, monitor.como_dicionario()['custo'])
+
+    def test_benchmark(self):
+        """
+        Testa se o corpus do benchmark é reprodutível e tem os custos ótimos corretos, e se a
+        comparação com a base aponta regressões
+        :return:
+        """
+        corpus = benchmark.gera_corpus(2, ((0, 9), (20, 31)), semente=7)
+        self.assertEqual(corpus, benchmark.gera_corpus(2, ((0, 9), (20, 31)), semente=7))
+        for faixa, (minimo, maximo) in zip(corpus.values(), [(0, 9), (20, 31)]):
+            self.assertEqual(2, len(faixa))
+            for estado, custo in faixa:
+                self.assertTrue(minimo <= custo <= maximo)
+                self.assertEqual(custo, len(solucao.astar(estado).caminho))
+
+        resultados = benchmark.executa(1, ((20, 24),), semente=7, algoritmos=['astar_manhattan'],
+                                       repeticoes=1, saida=None)
+        self.assertEqual([], benchmark.compara(resultados, resultados))
+
+        base = {**resultados, 'algoritmos': {'astar_manhattan': {'20-24': {
+            **resultados['algoritmos']['astar_manhattan']['20-24'], 'nodos_expandidos': 1}}}}
+        regressoes = benchmark.compara(resultados, base)
+        self.assertEqual(1, len(regressoes))
+        self.assertIn("nodos expandidos", regressoes[0])
+
+    def test_cache_de_solucoes(self):
+        """
+        Testa se o cache responde estados do caminho guardado, estados espelhados e se descarta
+        os menos usados ao passar da capacidade
+        :return:
+        """
+        cache = solucao.CacheDeSolucoes(capacidade=26)
+        estado = "2_3541687"
+        caminho = solucao.astar(estado).caminho
+        cache.guarda('astar', estado, caminho)
+        self.assertEqual(caminho, cache.consulta('astar', estado))
+        self.assertIsNone(cache.consulta('bfs', estado))
+
+        intermediario = solucao.altera_estado(solucao.altera_estado(estado, caminho[0]), caminho[1])
+        self.assertEqual(caminho[2:], cache.consulta('astar', intermediario))
+
+        puzzle = solucao.OITO_PUZZLE
+        for original in [estado, intermediario]:
+            espelho = puzzle.decodifica(puzzle.transpoe(puzzle.codifica(original)))
+            final = espelho
+            for acao in cache.consulta('astar', espelho):
+                final = solucao.altera_estado(final, acao)
+            self.assertEqual(puzzle.estado_final, final)
+
+        # "1235_6478" é o espelho de um estado do caminho guardado
+        self.assertEqual(['esquerda', 'abaixo', 'direita', 'direita'], cache.consulta('astar', "1235_6478"))
+
+        cache.guarda('astar', "8672543_1", solucao.astar("8672543_1").caminho)
+        self.assertEqual(26, len(cache.entradas))
+        self.assertIsNone(cache.consulta('astar', estado))          # o início do caminho antigo foi descartado
+        self.assertEqual(31, len(cache.consulta('astar', "8672543_1")))
+
+    def test_limite_de_busca(self):
+        """
+        Testa se as buscas param ao atingir o limite de nodos ou de tempo, retornando um resultado
+        esgotado com as estatísticas parciais, e se o timer reaproveita o processo trabalhador
+        :return:
+        """
+        for busca in [solucao.astar, solucao.idastar, solucao.busca_bidirecional, solucao.astar_bidirecional]:
+            resultado = busca("8672543_1", limite_nodos=100)
+            self.assertTrue(resultado.esgotado)
+            self.assertIsNone(resultado.caminho)
+            self.assertEqual(100, resultado.nodos_expandidos)
+            self.assertTrue(busca("8672543_1", tempo_limite=0).esgotado)
+            self.assertFalse(busca("2_3541687", limite_nodos=100000).esgotado)
+
+        self.assertFalse(solucao.astar("185423_67", limite_nodos=1).esgotado)   # sem solução não é esgotado
+
+        self.assertEqual(23, len(timer.timeout(solucao.astar_manhattan, args=("2_3541687",))))
+        processo = timer._worker[0]
+        self.assertEqual(31, len(timer.timeout(solucao.astar_manhattan, args=("8672543_1",))))
+        self.assertIs(processo, timer._worker[0])                    # mesmo trabalhador nas duas chamadas
+        self.assertEqual('timeout', timer.timeout(busca_lenta, args=("2_3541687",), time_limit=0.2, default='timeout'))
+        self.assertEqual(23, len(timer.timeout(solucao.astar_manhattan, args=("2_3541687",))))
+
+        respostas = {}                                              # chamadas concorrentes recebem as próprias respostas
+        def chama(estado):
+            respostas[estado] = timer.timeout(solucao.distancia_manhattan, args=(estado,))
+        estados = ["2_3541687", "8672543_1", "1235_6478", "12345678_"] * 5
+        threads = [threading.Thread(target=chama, args=(estado,)) for estado in estados]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual({estado: solucao.distancia_manhattan(estado) for estado in estados}, respostas)
+
+    def test_servico(self):
+        """
+        Testa se o serviço escreve uma linha JSON por estado, na ordem da entrada quando pedido,
+        com erros nas linhas inválidas
+        :return:
+        """
+        estados = ["8672543_1", "2_3541687", "185423_67", "2_3541687", "12345", "12345678_"]
+        esperados = [31, 23, None, 23, None, 0]
+
+        for workers in [0, 2]:
+            registros = list(servico.resolve_fluxo(enumerate(estados, 1), workers=workers, ordenado=True))
+            self.assertEqual(list(range(1, 7)), [registro['linha'] for registro in registros])
+            self.assertEqual(esperados, [registro.get('custo') for registro in registros])
+            self.assertIn('erro', registros[4])
+            self.assertGreater(registros[1]['nodos_expandidos'], 0)
+
+        registros = list(servico.resolve_fluxo(enumerate(estados, 1), workers=2, em_andamento=1))
+        self.assertEqual(sorted(range(1, 7)), sorted(registro['linha'] for registro in registros))
+
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'estados.txt')
+            with open(caminho, 'w') as arquivo:
+                arquivo.write("2_3541687\n\n8672543_1\n")
+            saida = io.StringIO()
+            with contextlib.redirect_stdout(saida):
+                servico.main([caminho, '--algoritmo', 'idastar_manhattan', '--limite-nodos', '100'])
+
+        registros = [json.loads(linha) for linha in saida.getvalue().splitlines()]
+        self.assertEqual([1, 3], [registro['linha'] for registro in registros])
+        self.assertTrue(all(registro['esgotado'] for registro in registros))
+
+    def test_operacoes_em_lote(self):
+        """
+        Testa se as heurísticas e os sucessores em lote coincidem com as versões por estado e se as
+        buscas em lote encontram caminhos que levam ao objetivo
+        :return:
+        """
+        estados = ["2_3541687", "8672543_1", "185432_67", "12345678_"]
+        tabuleiros = solucao.tabuleiros_de_estados(estados)
+        self.assertEqual((4, 9), tabuleiros.shape)
+        self.assertEqual(estados, solucao.estados_de_tabuleiros(tabuleiros))
+        self.assertEqual([solucao.distancia_manhattan(e) for e in estados], solucao.distancia_manhattan_lote(tabuleiros).tolist())
+        self.assertEqual([solucao.distancia_hamming(e) for e in estados], solucao.distancia_hamming_lote(tabuleiros).tolist())
+
+        filhos, pais, acoes = solucao.sucessores_lote(tabuleiros)
+        esperados = {(estado, sucessor) for estado in estados for sucessor in solucao.sucessor(estado)}
+        obtidos = {(estados[pai], (solucao.ACOES[acao], filho))
+                   for pai, acao, filho in zip(pais, acoes, solucao.estados_de_tabuleiros(filhos))}
+        self.assertEqual(esperados, obtidos)
+        self.assertEqual([solucao.rank_estado(solucao.codifica_estado(e)) for e in estados],
+                         solucao.rank_lote(tabuleiros).tolist())
+
+        self.assertEqual(23, len(solucao.bfs_lote("2_3541687")))
+        self.assertIsNone(solucao.bfs_lote("185423_67"))
+        for estado in ["8672543_1", "2_3541687"]:
+            final = estado
+            for acao in solucao.busca_em_feixe_manhattan(estado, 100):
+                final = solucao.altera_estado(final, acao)
+            self.assertEqual(solucao.DadosSolucaoPuzzle.estado_final, final)
+
+        self.assertEqual([solucao.codifica_estado(e) for e in estados], solucao.codigos_lote(tabuleiros))
+        puzzle_4x4 = solucao.pega_puzzle(4)
+        estado_4x4 = "1 2 3 4 5 6 _ 8 9 10 7 11 13 14 15 12"
+        self.assertEqual([puzzle_4x4.codifica(estado_4x4)],
+                         solucao.codigos_lote(solucao.tabuleiros_de_estados([estado_4x4], puzzle_4x4), puzzle_4x4))
+
+        expandidos = []
+        monitor = solucao.MonitorDeBusca(ao_expandir=expandidos.append)
+        resultado = solucao.busca_em_camadas_lote("8672543_1", 50, monitor=monitor)
+        self.assertEqual(resultado.nodos_expandidos, len(expandidos))
+        self.assertTrue(all(isinstance(codigo, int) for codigo in expandidos))
+        self.assertEqual(solucao.codifica_estado("8672543_1"), expandidos[0])
+        gerados_no_feixe = sum(len(solucao.sucessor(solucao.decodifica_estado(codigo))) for codigo in expandidos)
+        cortados = gerados_no_feixe - (resultado.nodos_gerados - 1) - resultado.duplicados_descartados
+        self.assertGreater(cortados, 0)                             # cortes do feixe não contam como duplicados
+
+    def test_fronteira_de_baldes(self):
+        """
+        Testa se a fronteira de baldes retira pelo menor f e, no mesmo f, pelo maior g (LIFO), e se o
+        A* com ela encontra os mesmos custos ótimos que com o heap
+        :return:
+        """
+        fronteira = solucao.FronteiraDeBaldes()
+        for f, g, entrada in [(5, 1, 'a'), (3, 0, 'b'), (5, 3, 'c'), (5, 3, 'd'), (4, 2, 'e')]:
+            fronteira.insere(f, g, entrada)
+        self.assertEqual(5, len(fronteira))
+        self.assertEqual(['b', 'e', 'd', 'c'], [fronteira.retira() for _ in range(4)])
+        fronteira.insere(2, 2, 'f')                                 # f menor que o atual
+        self.assertEqual(['f', 'a'], [fronteira.retira() for _ in range(2)])
+        self.assertEqual(0, len(fronteira))
+        self.assertRaises(IndexError, fronteira.retira)
+
+        for estado in ["2_3541687", "1235_6478", "12345678_"]:
+            for heuristica in ['hamming', 'manhattan', 'padroes']:
+                for armazem in solucao.ARMAZENS:
+                    custo_heap = len(solucao.astar(estado, heuristica, armazem=armazem).caminho)
+                    resultado = solucao.astar(estado, heuristica, armazem=armazem, fronteira='baldes')
+                    self.assertEqual(custo_heap, len(resultado.caminho))
+        self.assertEqual(31, len(solucao.astar("8672543_1", fronteira='baldes').caminho))
+        self.assertIsNone(solucao.astar("185423_67", fronteira='baldes').caminho)
+
+    def test_buscas_subotimas(self):
+        """
+        Testa se o A* ponderado, a busca gulosa e o ARA* encontram caminhos dentro do fator de
+        subotimalidade informado, e se o ARA* melhora a solução até a ótima
+        :return:
+        """
+        for estado, custo_otimo in [("2_3541687", 23), ("8672543_1", 31), ("1235_6478", 4), ("12345678_", 0)]:
+            for peso in [1, 1.5, 2, 5]:
+                resultado = solucao.astar(estado, 'manhattan', peso=peso)
+                self.assertEqual(max(1, peso), resultado.fator_subotimo)
+                self.assertTrue(custo_otimo <= len(resultado.caminho) <= resultado.fator_subotimo * custo_otimo)
+            resultado = solucao.astar(estado, 'manhattan', peso=math.inf, fronteira='baldes')
+            self.assertEqual(math.inf, resultado.fator_subotimo)
+            self.assertGreaterEqual(len(resultado.caminho), custo_otimo)
+
+            iteracoes = []
+            resultado = solucao.ara_estrela(estado, ao_melhorar=iteracoes.append)
+            self.assertEqual(custo_otimo, len(resultado.caminho))
+            self.assertEqual(1, resultado.fator_subotimo)
+            fatores = [iteracao.fator_subotimo for iteracao in iteracoes]
+            self.assertEqual(sorted(fatores, reverse=True), fatores)
+            for iteracao in iteracoes:
+                self.assertLessEqual(len(iteracao.caminho), iteracao.fator_subotimo * custo_otimo)
+
+        resultado = solucao.ara_estrela("8672543_1", limite_nodos=2000)
+        self.assertTrue(resultado.esgotado)
+        self.assertLessEqual(31, len(resultado.caminho))
+        self.assertLessEqual(len(resultado.caminho), resultado.fator_subotimo * 31)
+        self.assertIsNone(solucao.ara_estrela("8672543_1", limite_nodos=10).caminho)
+        self.assertIsNone(solucao.ara_estrela("185423_67").caminho)
+        self.assertIsNone(solucao.busca_gulosa_manhattan("185423_67"))
+        self.assertRaises(ValueError, solucao.astar, "2_3541687", peso=0)
+
+    def test_astar_paralelo(self):
+        """
+        Testa se o A* paralelo (HDA*) encontra os custos ótimos com vários trabalhadores, inclusive no
+        4x4, e se respeita o limite de nodos
+        :return:
+        """
+        self.assertEqual(['acima', 'abaixo', 'direita'], paralelo.decodifica_caminho(0b001011, 3))
+        self.assertEqual({0, 1, 2}, {paralelo.dono_do_estado(codigo, 3) for codigo in range(100)})
+
+        estado_4x4 = "1 2 3 4 5 6 _ 8 9 10 7 11 13 14 15 12"
+        for estado, custo_otimo in [("2_3541687", 23), ("8672543_1", 31), ("1235_6478", 4), (estado_4x4, 3)]:
+            for workers in [1, 3]:
+                caminho = paralelo.astar_paralelo(estado, workers=workers).caminho
+                self.assertEqual(custo_otimo, len(caminho))
+                self.assertEqual(solucao.puzzle_do_estado(estado).estado_final,
+                                 functools.reduce(solucao.altera_estado, caminho, estado))
+        self.assertEqual([], paralelo.astar_paralelo_manhattan("12345678_", workers=2))
+        self.assertIsNone(paralelo.astar_paralelo_manhattan("185423_67", workers=2))
+
+        resultado = paralelo.astar_paralelo("8672543_1", workers=2, limite_nodos=100)
+        self.assertTrue(resultado.esgotado)
+        self.assertIsNone(resultado.caminho)
+
+        # nos trabalhadores, a espera do ocioso sempre estoura: as remessas só chegam pela leitura do início do laço
+        get_original = multiprocessing.queues.Queue.get
+        processo_principal = os.getpid()
+        def get_sem_espera(fila, block=True, timeout=None):
+            if block and timeout is not None and os.getpid() != processo_principal:
+                time.sleep(timeout)
+                raise queue.Empty
+            return get_original(fila, block, timeout)
+        with mock.patch.object(multiprocessing.queues.Queue, 'get', get_sem_espera):
+            for _ in range(5):
+                for estado, custo_otimo in [("8672543_1", 31), ("2_3541687", 23)]:
+                    caminho = paralelo.astar_paralelo(estado, workers=3, tamanho_remessa=100000).caminho
+                    self.assertIsNotNone(caminho)
+                    self.assertEqual(custo_otimo, len(caminho))
+
     def test_action_order(self):
         """
         Testa se A* retornam a sequencia de acoes na ordem correta
@@ -86,7 +646,8 @@ class TestaSolucao(unittest.TestCase):
         estado = "1235_6478"
         solucao_otima = ['esquerda', 'abaixo', 'direita', 'direita']
 
-        for alg in [solucao.astar_hamming, solucao.astar_manhattan]:
+        for alg in [solucao.astar_hamming, solucao.astar_manhattan, solucao.astar_new_heuristic,
+                    solucao.idastar_manhattan, solucao.bfs, solucao.bfs_lote, solucao.astar_bidirecional_manhattan]:
             self.assertEqual(solucao_otima, self.run_algorithm(alg, estado))
 
 if __name__ == '__main__':
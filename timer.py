@@ -1,26 +1,87 @@
 import multiprocessing as mp
+import threading
+
+# Long-lived worker (process, connection), reused by every call and replaced only after a timeout
+_worker = None
+# Serializes the calls, which share the worker and its connection
+_lock = threading.Lock()
+
+
+def _serve(connection):
+    """
+    Worker loop: receives (func, args, kwargs) through the connection and sends back
+    (True, value) or (False, exception) until it receives None
+    :param connection: multiprocessing.connection.Connection
+    """
+    while True:
+        task = connection.recv()
+        if task is None:
+            break
+        func, args, kwargs = task
+        try:
+            connection.send((True, func(*args, **kwargs)))
+        except Exception as error:
+            connection.send((False, error))
+
+
+def _get_worker():
+    """
+    Returns the worker (process, connection), starting it if there is none alive
+    :return: tuple
+    """
+    global _worker
+    if _worker is None or not _worker[0].is_alive():
+        context = mp.get_context('fork' if 'fork' in mp.get_all_start_methods() else None)
+        parent_connection, child_connection = context.Pipe()
+        process = context.Process(target=_serve, args=(child_connection,), daemon=True)
+        process.start()
+        child_connection.close()
+        _worker = (process, parent_connection)
+    return _worker
+
+
+def _kill_worker():
+    """
+    Terminates the worker, which is started again on the next call
+    """
+    global _worker
+    process, connection = _worker
+    process.terminate()
+    process.join()
+    connection.close()
+    _worker = None
 
 
 def timeout(func, args=(), kwargs={}, time_limit=999999, default=None):
     """
     Runs a function, interrupting it and returning
     a 'default' value after a time limit.
-    kudos: https://stackoverflow.com/a/13822315/1251716
-    :param func: the function to run
+    The function runs in a long-lived worker process, so only calls that time out
+    pay for starting a new process. Module state changed by one call in the worker
+    (e.g. eight_puzzle.solucao.CACHE_SOLUCOES) persists into the following calls until
+    a timeout replaces the worker. Calls from different threads run one at a time, and
+    time_limit counts only the time of this call in the worker.
+    For searches in eight_puzzle.solucao prefer their own tempo_limite/limite_nodos,
+    which stop the search without any process.
+    :param func: the function to run (must be picklable, e.g. defined at module level)
     :param args: function args
     :param kwargs: function keyword args
     :param time_limit: time limit, in seconds
     :param default: default value to be returned on timeout
     :return:
     """
-    pool = mp.Pool(processes=1)
-    result = pool.apply_async(func, args=args, kwds=kwargs)
-    try:
-        val = result.get(timeout=time_limit)
-    except mp.TimeoutError:
-        pool.terminate()
-        return default
-    else:
-        pool.close()
-        pool.join()
-        return val
+    with _lock:
+        process, connection = _get_worker()
+        connection.send((func, args, kwargs))
+        if not connection.poll(time_limit):
+            _kill_worker()
+            return default
+
+        try:
+            ok, value = connection.recv()
+        except EOFError:            # the worker died while running the function
+            _kill_worker()
+            raise
+    if not ok:
+        raise value
+    return value